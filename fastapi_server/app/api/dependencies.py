@@ -0,0 +1,20 @@
+"""Shared route dependencies."""
+
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from app.config import settings
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only with the configured admin token."""
+    if not settings.admin_token:
+        raise HTTPException(
+            status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN unset)"
+        )
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token, settings.admin_token
+    ):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
@@ -1,25 +1,43 @@
 """Career recommendation API endpoints."""
 
 from typing import List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from pydantic import ValidationError
 
+from app.api.dependencies import require_admin
+from app.config import settings
 from app.models.career import (
     CareerInput,
     CareerRecommendation,
     CoursePrediction,
+    CareerBatchInput,
+    CareerBatchItemResult,
+    CareerBatchResponse,
     CareerFeedback,
     CareerLists,
+    CareerModelReloadRequest,
+    CareerModelVersions,
 )
-from app.services.career_service import career_predictor
-from app.core.exceptions import ModelNotLoadedError, PredictionError
+from app.services.loader import get_career_predictor
+from app.core.exceptions import (
+    ModelNotLoadedError,
+    ModelVersionNotFoundError,
+    PredictionError,
+    ServiceOverloadedError,
+)
+from app.core.executor import model_executor
 from app.core.logging import get_logger
+from app.core.timing import request_timings
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/career", tags=["Career"])
 
 
 @router.post("/predict", response_model=CareerRecommendation)
-async def predict_career(input_data: CareerInput):
+async def predict_career(
+    input_data: CareerInput,
+    detailed: bool = Query(False, description="Include the stage timings"),
+):
     """
     Predict career/course recommendation based on student profile.
 
@@ -27,12 +45,15 @@ async def predict_career(input_data: CareerInput):
     - **interest**: Comma or semicolon separated interests
     - **skills**: Comma or semicolon separated skills
     - **grades**: CGPA or percentage (0-100)
+    - **detailed**: Also return the wall time of each stage (always sent in
+      the Server-Timing header)
 
     Returns the predicted course along with confidence score and top 3 predictions.
     """
     try:
-        # Make prediction
-        result = career_predictor.predict(
+        # Make prediction off the event loop
+        result = await model_executor.run(
+            get_career_predictor().predict,
             gender=input_data.gender,
             interest=input_data.interest,
             skills=input_data.skills,
@@ -46,8 +67,13 @@ async def predict_career(input_data: CareerInput):
             top_predictions=[
                 CoursePrediction(**pred) for pred in result["top_predictions"]
             ],
+            model_version=result["model_version"],
+            timings_ms=request_timings("career") if detailed else None,
         )
 
+    except ServiceOverloadedError:
+        # Answered with 503 and Retry-After by the app-level handler
+        raise
     except ModelNotLoadedError as e:
         raise HTTPException(status_code=503, detail=f"Model not loaded: {str(e)}")
     except ValueError as e:
@@ -59,32 +85,107 @@ async def predict_career(input_data: CareerInput):
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 
+@router.post("/predict/batch", response_model=CareerBatchResponse)
+async def predict_career_batch(batch: CareerBatchInput):
+    """
+    Predict career/course recommendations for many student profiles at once.
+
+    - **items**: List of records with the same fields as `/career/predict`
+
+    All valid items are encoded, scaled and scored in a single matrix pass.
+    Each item is validated independently, so one bad record does not fail the
+    batch; its error is reported in its own result instead.
+    """
+    if len(batch.items) > settings.career_batch_max_size:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(batch.items)} items "
+            f"(max {settings.career_batch_max_size})",
+        )
+
+    results = [CareerBatchItemResult(index=i) for i in range(len(batch.items))]
+
+    # Validate each item on its own so errors can be reported per item
+    valid_indices = []
+    records = []
+    for i, item in enumerate(batch.items):
+        try:
+            record = CareerInput.model_validate(item)
+        except ValidationError as e:
+            results[i].error = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                for err in e.errors()
+            )
+            continue
+        valid_indices.append(i)
+        records.append(record.model_dump())
+
+    try:
+        predictions = (
+            await model_executor.run(get_career_predictor().predict_batch, records)
+            if records
+            else []
+        )
+    except ServiceOverloadedError:
+        # Answered with 503 and Retry-After by the app-level handler
+        raise
+    except ModelNotLoadedError as e:
+        raise HTTPException(status_code=503, detail=f"Model not loaded: {str(e)}")
+    except PredictionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch prediction error: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Batch prediction failed: {str(e)}"
+        )
+
+    for i, outcome in zip(valid_indices, predictions):
+        if outcome["error"] is not None:
+            results[i].error = outcome["error"]
+            continue
+        result = outcome["prediction"]
+        results[i].recommendation = CareerRecommendation(
+            predicted_course=result["predicted_course"],
+            confidence=result["confidence"],
+            top_predictions=[
+                CoursePrediction(**pred) for pred in result["top_predictions"]
+            ],
+            model_version=result["model_version"],
+        )
+
+    failed = sum(1 for result in results if result.error is not None)
+    return CareerBatchResponse(
+        results=results, succeeded=len(results) - failed, failed=failed
+    )
+
+
 @router.get("/lists", response_model=CareerLists)
 async def get_all_lists():
     """Get all valid options for interests, skills, and courses."""
+    predictor = get_career_predictor()
     return CareerLists(
-        interests=career_predictor.get_interests(),
-        skills=career_predictor.get_skills(),
-        courses=career_predictor.get_courses(),
+        interests=predictor.get_interests(),
+        skills=predictor.get_skills(),
+        courses=predictor.get_courses(),
     )
 
 
 @router.get("/lists/interests", response_model=List[str])
 async def get_interests():
     """Get list of valid interests."""
-    return career_predictor.get_interests()
+    return get_career_predictor().get_interests()
 
 
 @router.get("/lists/skills", response_model=List[str])
 async def get_skills():
     """Get list of valid skills."""
-    return career_predictor.get_skills()
+    return get_career_predictor().get_skills()
 
 
 @router.get("/lists/courses", response_model=List[str])
 async def get_courses():
     """Get list of valid courses."""
-    return career_predictor.get_courses()
+    return get_career_predictor().get_courses()
 
 
 @router.post("/feedback")
@@ -94,8 +195,9 @@ async def submit_feedback(feedback: CareerFeedback):
 
     This is used to collect data for future model training.
     """
+    predictor = get_career_predictor()
     try:
-        career_predictor.log_feedback(
+        predictor.log_feedback(
             gender=feedback.gender,
             interest=feedback.interest,
             skills=feedback.skills,
@@ -108,6 +210,50 @@ async def submit_feedback(feedback: CareerFeedback):
         raise HTTPException(status_code=500, detail="Failed to log feedback")
 
 
+@router.get("/models", response_model=CareerModelVersions)
+async def get_model_versions():
+    """List the available career model versions and the one serving predictions."""
+    return CareerModelVersions(**get_career_predictor().model_versions())
+
+
+@router.post(
+    "/models/reload",
+    response_model=CareerModelVersions,
+    status_code=202,
+    dependencies=[Depends(require_admin)],
+)
+async def reload_models(
+    request: CareerModelReloadRequest, background_tasks: BackgroundTasks
+):
+    """
+    Load a career model version in the background and swap it in.
+
+    - **version**: Version directory under the models directory (default: newest)
+
+    Requires the `X-Admin-Token` header. The new version is validated before
+    it replaces the serving one; requests keep being answered by the current
+    version meanwhile. Poll `GET /career/models` for the outcome.
+
+    The reload runs in the worker process that receives the request. Once it
+    succeeds, the version is published in the models directory and the other
+    workers follow within `CAREER_MODEL_SYNC_SECONDS` (plus their own load
+    time); `GET /career/models` reports the answering worker's state.
+    """
+    predictor = get_career_predictor()
+    version = request.version or predictor.registry.latest()
+    try:
+        if version is None:
+            raise ModelVersionNotFoundError("No model versions found")
+        predictor.registry.path(version)
+    except ModelVersionNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if not predictor.request_reload(version):
+        raise HTTPException(status_code=409, detail="A model reload is already running")
+    background_tasks.add_task(predictor.reload, version)
+    return CareerModelVersions(**predictor.model_versions())
+
+
 @router.get("/info")
 async def get_info():
     """Get information about the career recommendation model."""
@@ -125,6 +271,9 @@ async def get_info():
             "Standard scaling for all features",
         ],
         "output": "Course recommendation with confidence scores",
+        "model_version": get_career_predictor().version,
+        "batch_endpoint": "/api/v1/career/predict/batch",
+        "models_endpoint": "/api/v1/career/models",
         "valid_options_endpoints": [
             "/api/v1/career/lists/interests",
             "/api/v1/career/lists/skills",
@@ -1,68 +1,237 @@
 """CLIP image comparison API endpoints."""
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from pathlib import Path
-import tempfile
-import os
-
-from app.models.clip import CLIPCompareResponse
-from app.services.clip_service import clip_service
-from app.core.exceptions import ModelNotLoadedError, PredictionError
+from fastapi import APIRouter, Depends, File, Form, Query, UploadFile, HTTPException
+from typing import Optional
+
+from app.api.dependencies import require_admin
+from app.models.clip import CLIPCompareResponse, CLIPProfilesResponse, CLIPReferenceResponse
+from app.services.loader import get_clip_service
+from app.core.exceptions import (
+    InvalidInputError,
+    ModelNotLoadedError,
+    PredictionError,
+    ReferenceNotFoundError,
+    ServiceOverloadedError,
+)
+from app.config import settings
+from app.core.executor import model_executor
 from app.core.logging import get_logger
+from app.core.timing import request_timings
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/clip", tags=["CLIP"])
 
 
+ALLOWED_TYPES = {"image/jpeg", "image/png", "image/jpg", "image/webp"}
+
+
+def _validate_image_type(upload: UploadFile, field: str):
+    """Reject uploads that are not a supported image type."""
+    if upload.content_type not in ALLOWED_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type for {field}: {upload.content_type}"
+        )
+
+
+def _compare_response(result: dict, detailed: bool) -> CLIPCompareResponse:
+    """Build the comparison response, with the breakdown if requested."""
+    return CLIPCompareResponse(
+        similarity=result["similarity"],
+        message="Images compared successfully",
+        profile=result["profile"],
+        stages=result["stages"],
+        early_exit=result["early_exit"],
+        scores=result["scores"] if detailed else None,
+        # The request's spans add the model executor wait to the stage times
+        timings_ms=(request_timings("clip") or result["timings_ms"]) if detailed else None
+    )
+
+
+async def _read_upload(upload: UploadFile) -> bytes:
+    """Read an uploaded file into memory.
+    
+    The bytes are passed on unchanged: io.BytesIO shares the buffer of a
+    bytes object when decoding, while it would copy a memoryview.
+    """
+    return await upload.read()
+
+
+@router.get("/profiles", response_model=CLIPProfilesResponse)
+async def list_profiles():
+    """List the hybrid scoring profiles and their metric weights."""
+    return CLIPProfilesResponse(
+        default=settings.clip_default_profile,
+        profiles=settings.clip_scoring_profiles
+    )
+
+
 @router.post("/compare", response_model=CLIPCompareResponse)
 async def compare_images(
     image1: UploadFile = File(..., description="First image to compare"),
-    image2: UploadFile = File(..., description="Second image to compare")
+    image2: UploadFile = File(..., description="Second image to compare"),
+    profile: Optional[str] = Query(None, description="Scoring profile (see /clip/profiles)"),
+    cascade: Optional[bool] = Query(None, description="Stop early once the score is clearly high or low"),
+    detailed: bool = Query(False, description="Include per-metric scores and timings")
 ):
     """
     Compare two images using CLIP model and return similarity score.
     
     - **image1**: First image file (JPEG, PNG, etc.)
     - **image2**: Second image file (JPEG, PNG, etc.)
+    - **profile**: Scoring profile, e.g. "fast" (SSIM + edges only) for
+      cheap pre-screening; defaults to the full "hybrid" profile
+    - **cascade**: Run the cheap metrics first and skip the rest (usually
+      the CLIP forward pass) when the score is already clearly above or
+      below the cascade thresholds
+    - **detailed**: Also return the per-metric scores and wall times
     
     Returns a similarity score between 0 and 1 (higher means more similar).
     """
-    temp_files = []
-    
     try:
         # Validate file types
-        allowed_types = {"image/jpeg", "image/png", "image/jpg", "image/webp"}
-        if image1.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type for image1: {image1.content_type}"
-            )
-        if image2.content_type not in allowed_types:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid file type for image2: {image2.content_type}"
-            )
+        _validate_image_type(image1, "image1")
+        _validate_image_type(image2, "image2")
         
-        # Save uploaded files to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(image1.filename).suffix) as tmp1:
-            content1 = await image1.read()
-            tmp1.write(content1)
-            temp1_path = tmp1.name
-            temp_files.append(temp1_path)
+        # Read uploads into memory; images are decoded from the buffers
+        image1_data = await _read_upload(image1)
+        image2_data = await _read_upload(image2)
         
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(image2.filename).suffix) as tmp2:
-            content2 = await image2.read()
-            tmp2.write(content2)
-            temp2_path = tmp2.name
-            temp_files.append(temp2_path)
+        # Compute similarity off the event loop
+        result = await model_executor.run(
+            get_clip_service().compute_similarity_detailed, image1_data, image2_data, profile, cascade
+        )
         
-        # Compute similarity
-        similarity = clip_service.compute_similarity(temp1_path, temp2_path)
+        return _compare_response(result, detailed)
+    
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ModelNotLoadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"CLIP model not loaded: {str(e)}"
+        )
+    except PredictionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except (HTTPException, ServiceOverloadedError):
+        # ServiceOverloadedError is answered by the app-level handler
+        raise
+    except Exception as e:
+        logger.error(f"CLIP comparison error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to compare images: {str(e)}"
+        )
+
+
+@router.post("/references", response_model=CLIPReferenceResponse, status_code=201)
+async def register_reference(
+    image: UploadFile = File(..., description="Reference image (e.g. an outline)")
+):
+    """
+    Register a reference image and precompute its features.
+    
+    - **image**: Reference image file (JPEG, PNG, etc.)
+    
+    Returns a `reference_id` (the content hash of the image) to use with
+    `/clip/compare/reference`. Registering the same image again returns the
+    same id.
+    """
+    try:
+        _validate_image_type(image, "image")
+        image_data = await _read_upload(image)
         
-        return CLIPCompareResponse(
-            similarity=similarity,
-            message="Images compared successfully"
+        reference = await model_executor.run(
+            get_clip_service().register_reference, image_data, image.filename
+        )
+        
+        return CLIPReferenceResponse(
+            reference_id=reference["reference_id"],
+            filename=reference.get("filename"),
+            created_at=reference.get("created_at")
+        )
+    
+    except ModelNotLoadedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"CLIP model not loaded: {str(e)}"
         )
+    except PredictionError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    except (HTTPException, ServiceOverloadedError):
+        # ServiceOverloadedError is answered by the app-level handler
+        raise
+    except Exception as e:
+        logger.error(f"Reference registration error: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to register reference image: {str(e)}"
+        )
+
+
+# Plain functions: FastAPI runs them on its thread pool, keeping the file
+# system access off the event loop
+@router.get("/references/{reference_id}", response_model=CLIPReferenceResponse)
+def get_reference(reference_id: str):
+    """Get the metadata of a registered reference image."""
+    store = get_clip_service().reference_store
+    metadata = store.metadata(reference_id) if store.is_valid_id(reference_id) else None
+    if metadata is None:
+        raise HTTPException(status_code=404, detail=f"Reference image not found: {reference_id}")
+    
+    return CLIPReferenceResponse(
+        reference_id=metadata["reference_id"],
+        filename=metadata.get("filename"),
+        created_at=metadata.get("created_at"),
+        message="Reference image found"
+    )
+
+
+@router.delete("/references/{reference_id}", dependencies=[Depends(require_admin)])
+def delete_reference(reference_id: str):
+    """Delete a registered reference image (requires the X-Admin-Token header)."""
+    store = get_clip_service().reference_store
+    if not store.is_valid_id(reference_id) or not store.delete(reference_id):
+        raise HTTPException(status_code=404, detail=f"Reference image not found: {reference_id}")
+    return {"message": "Reference image deleted successfully"}
+
+
+@router.post("/compare/reference", response_model=CLIPCompareResponse)
+async def compare_with_reference(
+    reference_id: str = Form(..., description="Id of a registered reference image"),
+    image: UploadFile = File(..., description="Drawn image to compare"),
+    profile: Optional[str] = Query(None, description="Scoring profile (see /clip/profiles)"),
+    cascade: Optional[bool] = Query(None, description="Stop early once the score is clearly high or low"),
+    detailed: bool = Query(False, description="Include per-metric scores and timings")
+):
+    """
+    Compare an image against a registered reference image.
+    
+    - **reference_id**: Id returned by `POST /clip/references`
+    - **image**: Drawn image file (JPEG, PNG, etc.)
+    - **profile**: Scoring profile, e.g. "fast" (SSIM + edges only) for
+      cheap pre-screening; defaults to the full "hybrid" profile
+    - **cascade**: Run the cheap metrics first and skip the rest (usually
+      the CLIP forward pass) when the score is already clearly above or
+      below the cascade thresholds
+    - **detailed**: Also return the per-metric scores and wall times
+    
+    Only the uploaded image is processed; the reference features are
+    precomputed. Returns a similarity score between 0 and 1.
+    """
+    try:
+        _validate_image_type(image, "image")
+        image_data = await _read_upload(image)
+        
+        result = await model_executor.run(
+            get_clip_service().compute_similarity_to_reference_detailed, reference_id, image_data, profile, cascade
+        )
+        
+        return _compare_response(result, detailed)
     
+    except ReferenceNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InvalidInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ModelNotLoadedError as e:
         raise HTTPException(
             status_code=503,
@@ -70,7 +239,8 @@ async def compare_images(
         )
     except PredictionError as e:
         raise HTTPException(status_code=500, detail=str(e))
-    except HTTPException:
+    except (HTTPException, ServiceOverloadedError):
+        # ServiceOverloadedError is answered by the app-level handler
         raise
     except Exception as e:
         logger.error(f"CLIP comparison error: {str(e)}")
@@ -78,11 +248,3 @@ async def compare_images(
             status_code=500,
             detail=f"Failed to compare images: {str(e)}"
         )
-    finally:
-        # Clean up temporary files
-        for temp_file in temp_files:
-            try:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-            except Exception as e:
-                logger.warning(f"Failed to delete temp file {temp_file}: {str(e)}")
@@ -1,23 +1,64 @@
-"""Health check endpoint."""
+"""Health (liveness) and readiness endpoints."""
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 
-from app.models.common import HealthResponse
-from app.services.career_service import career_predictor
-from app.services.clip_service import clip_service
+from app.core.executor import model_executor
+from app.models.common import HealthResponse, ReadinessResponse
+from app.services.loader import FAILED, MODEL_LOADERS, career_loader, clip_loader
 
 router = APIRouter(tags=["Health"])
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    """Health check endpoint to verify service status."""
-    career_loaded = career_predictor.is_loaded()
-    clip_loaded = clip_service.is_loaded()
+    """
+    Liveness check; answers immediately, also while models are loading.
     
-    all_healthy = career_loaded and clip_loaded
+    Returns 503 with status "unhealthy" while an enabled model has failed to
+    load (it is retried every model_load_retry_seconds), so an orchestrator
+    can restart the instance. Use /ready to find out whether the models can
+    serve requests. Disabled subsystems count as not loaded but do not
+    degrade the status.
+    """
+    career_predictor = career_loader.peek()
+    clip_service = clip_loader.peek()
     
-    return HealthResponse(
-        status="healthy" if all_healthy else "degraded",
-        model_loaded=career_loaded,
-        clip_loaded=clip_loaded
+    all_healthy = all(loader.ready for loader in MODEL_LOADERS.values())
+    any_failed = any(loader.status == FAILED for loader in MODEL_LOADERS.values())
+    if all_healthy:
+        status = "healthy"
+    elif any_failed:
+        status = "unhealthy"
+    else:
+        status = "degraded"
+    
+    health = HealthResponse(
+        status=status,
+        model_loaded=career_predictor is not None,
+        clip_loaded=clip_service is not None,
+        career_cache=career_predictor.cache_stats() if career_predictor is not None else None,
+        clip_feature_cache=clip_service.feature_cache_stats() if clip_service is not None else None,
+        model_executor=model_executor.stats()
+    )
+    return JSONResponse(
+        status_code=503 if any_failed else 200,
+        content=health.model_dump()
+    )
+
+
+@router.get("/ready", response_model=ReadinessResponse)
+async def readiness_check():
+    """
+    Readiness check with the loading status of each model.
+    
+    Returns 503 until every enabled model is loaded, so traffic is only routed to a
+    fully warmed-up instance.
+    """
+    readiness = ReadinessResponse(
+        ready=all(loader.ready for loader in MODEL_LOADERS.values()),
+        models={name: loader.state() for name, loader in MODEL_LOADERS.items()}
+    )
+    return JSONResponse(
+        status_code=200 if readiness.ready else 503,
+        content=readiness.model_dump()
     )
@@ -0,0 +1,48 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.executor import model_executor
+from app.core.metrics import (
+    CLIP_BATCHER_QUEUE_DEPTH,
+    MODEL_EXECUTOR_IN_FLIGHT,
+    MODEL_EXECUTOR_QUEUE_DEPTH,
+    MODEL_LOAD_SECONDS,
+    MODEL_READY,
+    metrics,
+)
+from app.services.loader import MODEL_LOADERS, clip_loader
+
+router = APIRouter(tags=["Monitoring"])
+
+# Content type of the Prometheus text exposition format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _sample_gauges():
+    """Read the current queue depths and model states into their gauges."""
+    MODEL_EXECUTOR_IN_FLIGHT.set(model_executor.in_flight)
+    MODEL_EXECUTOR_QUEUE_DEPTH.set(model_executor.queue_depth)
+
+    clip_service = clip_loader.peek()
+    if clip_service is not None and clip_service.batcher is not None:
+        CLIP_BATCHER_QUEUE_DEPTH.set(clip_service.batcher.queue_depth)
+
+    for name, loader in MODEL_LOADERS.items():
+        MODEL_READY.set(1 if loader.ready else 0, model=name)
+        if loader.load_seconds is not None:
+            MODEL_LOAD_SECONDS.set(loader.load_seconds, model=name)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Metrics of this process in the Prometheus text format.
+
+    Includes request counts and latencies per route, per-stage career and
+    CLIP timings, model executor and CLIP batcher queue depths and the load
+    time of each model. Under gunicorn every worker reports its own values.
+    """
+    _sample_gauges()
+    return PlainTextResponse(metrics.render(), media_type=CONTENT_TYPE)
@@ -1,7 +1,7 @@
 """Configuration for the Career Recommendation API."""
 import os
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
 from pydantic_settings import BaseSettings
 
 
@@ -20,6 +20,23 @@ class Settings(BaseSettings):
     # CORS Configuration
     allowed_origins: List[str] = ["*"]
     
+    # Subsystems; a disabled subsystem's routes are not mounted and its model
+    # (and libraries: torch/CLIP/OpenCV or sklearn) are never imported
+    enable_career: bool = True
+    enable_clip: bool = True
+    
+    # Prometheus metrics: request counts/latencies and per-stage model
+    # timings, served on /metrics
+    metrics_enabled: bool = True
+    
+    # Server-Timing header with each request's stage times (career.parse,
+    # clip.encode_image, executor_wait, ...)
+    server_timing_enabled: bool = True
+    
+    # Seconds after a failed model load before it is attempted again (0
+    # keeps the model failed until the worker restarts)
+    model_load_retry_seconds: float = 30.0
+    
     # Model paths - base_dir should be project root (d:\Projects\Project)
     # __file__ is fastapi_server/app/config/settings.py
     # parent: app/config -> parent: app -> parent: fastapi_server -> parent: Project root
@@ -31,11 +48,102 @@ class Settings(BaseSettings):
         """Get model file paths."""
         return {
             "random_forest": self.models_dir / "rf.sav",
+            "random_forest_grid": self.models_dir / "random_forest_grid2.sav",
             "scaler": self.models_dir / "sc.sav",
             "label_encoder": self.models_dir / "le.pkl",
             "multilabel_binarizer": self.models_dir / "mlb.pkl",
         }
     
+    # Career model registry: each models_dir/<version>/ holds one set of model
+    # files; files directly in models_dir are served as the default version.
+    # career_model_version picks the version served at startup (None: newest)
+    # unless a reload published models_dir/ACTIVE_VERSION, which every worker
+    # follows (checked at most every career_model_sync_seconds)
+    career_model_version: Optional[str] = None
+    career_default_model_version: str = "v1.0.0"
+    career_model_sync_seconds: float = 2.0
+    # Serve a version from its memory-mapped bundle (<version>/bundle/, see
+    # export_career_bundle.py) when it has one; False always unpickles
+    career_model_bundle: bool = True
+    
+    # Token expected in the X-Admin-Token header of admin endpoints (e.g.
+    # model reloads); admin endpoints are disabled while it is unset
+    admin_token: Optional[str] = None
+    
+    # Model executor (CPU-bound model work runs off the event loop)
+    model_executor_workers: int = 4
+    model_executor_max_queue: int = 32
+    model_executor_retry_after_seconds: int = 1
+    # Intra-op threads of torch and OpenCV (None keeps the library default);
+    # keep workers x threads within the CPU count to avoid oversubscription
+    torch_num_threads: Optional[int] = None
+    cv2_num_threads: Optional[int] = None
+
+    # Career prediction
+    career_batch_max_size: int = 5000
+    # Forest inference engine: "flat" (packed NumPy arrays, sklearn objects are
+    # released after loading) or "sklearn" (single forest.apply per batch)
+    career_forest_engine: str = "flat"
+    # LRU/TTL cache of predictions keyed on the normalized profile; grades
+    # are rounded in the key only (the model scores the exact grade)
+    career_cache_enabled: bool = True
+    career_cache_max_entries: int = 10000
+    career_cache_ttl_seconds: float = 3600.0
+    career_cache_grade_decimals: int = 2
+
+    # CLIP image comparison
+    # Named hybrid scoring profiles (metric -> relative weight); metrics
+    # with no or zero weight, and the features only they need, are never
+    # computed (e.g. "fast" skips the ViT forward pass)
+    clip_scoring_profiles: Dict[str, Dict[str, float]] = {
+        "hybrid": {"clip": 0.30, "ssim": 0.30, "edge": 0.30, "histogram": 0.10},
+        "fast": {"ssim": 0.50, "edge": 0.50},
+        "semantic": {"clip": 1.0},
+    }
+    clip_default_profile: str = "hybrid"
+    # Cascade mode: metric stages run cheapest first and the comparison stops
+    # once the final score is guaranteed to be above accept or below reject.
+    # A stage can only decide when accept <= weight computed so far or
+    # reject >= weight still remaining (0.7/0.3 before CLIP for "hybrid")
+    clip_cascade_enabled: bool = False
+    clip_cascade_stages: List[List[str]] = [["histogram", "edge"], ["ssim"], ["clip"]]
+    clip_cascade_accept_threshold: float = 0.60
+    clip_cascade_reject_threshold: float = 0.40
+    # Run the CLIP forward pass, feature extraction and metrics concurrently
+    # on a shared pool (separate from the model executor)
+    clip_parallel_metrics: bool = True
+    clip_metric_workers: int = 4
+    # Keep only the CLIP visual tower (the text encoder is never used). If
+    # clip_visual_weights points to a state dict from export_clip_visual.py,
+    # it is loaded instead of the full checkpoint
+    clip_visual_only: bool = False
+    clip_visual_weights: Optional[Path] = None
+    # Dynamic int8 quantization of the visual encoder's linear layers (CPU
+    # only). A startup self-check compares it with fp32 on sample images and
+    # keeps fp32 if the worst cosine drift exceeds the limit
+    clip_quantize_int8: bool = False
+    clip_quantization_check: bool = True
+    clip_quantization_max_drift: float = 0.02
+    # Micro-batching of encode_image across concurrent /clip/compare requests
+    clip_batching_enabled: bool = True
+    clip_batch_window_ms: float = 8.0
+    clip_batch_max_size: int = 16
+    # Longest expected forward pass of a full batch; a request waiting on the
+    # batcher gives up after the window plus two of these
+    clip_batch_max_inference_seconds: float = 10.0
+    # Content-addressed cache of per-image features (embedding, grayscale,
+    # edges, histogram), bounded by entries and memory
+    clip_feature_cache_enabled: bool = True
+    clip_feature_cache_max_entries: int = 4096
+    clip_feature_cache_max_mb: int = 128
+    # Longest side images are decoded to (JPEGs via draft mode); 0 decodes
+    # at full resolution
+    clip_max_decode_side: int = 1024
+    # Registered reference images (precomputed features as .npy files)
+    clip_reference_dir: Path = Path(__file__).parent.parent.parent / "data" / "clip_references"
+    # Open (memory-mapped) reference bundles kept per worker
+    clip_reference_cache_max_entries: int = 1024
+
     # Course mapping (encoded value -> course name)
     course_mapping: Dict[int, str] = {
         0: "B.A", 1: "B.Arch", 2: "B.Com", 3: "B.Des", 4: "B.Ed",
@@ -112,6 +220,7 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = False
         extra = "ignore"  # Ignore extra fields from .env file
+        protected_namespaces = ("settings_",)  # Allow model_* field names
 
 
 # Global settings instance
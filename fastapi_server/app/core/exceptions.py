@@ -14,3 +14,21 @@ class PredictionError(Exception):
 class InvalidInputError(Exception):
     """Raised when input validation fails."""
     pass
+
+
+class ServiceOverloadedError(Exception):
+    """Raised when the model executor queue is full."""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ReferenceNotFoundError(Exception):
+    """Raised when a reference image id is not registered."""
+    pass
+
+
+class ModelVersionNotFoundError(Exception):
+    """Raised when a model version is not in the model registry."""
+    pass
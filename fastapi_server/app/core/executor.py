@@ -0,0 +1,134 @@
+"""Bounded thread pool for CPU-bound model work."""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.core.exceptions import ServiceOverloadedError
+from app.core.metrics import MODEL_EXECUTOR_REJECTED
+from app.core.logging import get_logger
+from app.core.timing import record_span
+
+logger = get_logger(__name__)
+
+
+class ModelExecutor:
+    """Runs blocking model calls off the event loop with admission control.
+
+    At most ``max_workers`` calls run at once and at most ``max_queue`` more
+    wait for a worker. Anything beyond that is rejected immediately with
+    ServiceOverloadedError instead of queueing without bound, which keeps
+    tail latency predictable and leaves the event loop free for cheap
+    endpoints such as /health.
+
+    A call holds its slot until its worker thread finishes, even when the
+    awaiting request is cancelled (e.g. the client disconnected), so
+    abandoned calls still count against the limit while they run.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, retry_after: int = 1):
+        """Configure the executor; threads are started on first use.
+
+        Args:
+            max_workers: Number of worker threads
+            max_queue: Number of calls allowed to wait for a worker
+            retry_after: Seconds suggested to rejected clients
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Number of accepted calls that have not finished yet."""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of accepted calls waiting for a worker thread."""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="model-worker"
+            )
+        return self._pool
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` on a worker thread.
+
+        The call runs in a copy of the caller's context (as with
+        ``asyncio.to_thread``), so it records its spans in the request's
+        Server-Timing recorder; the wait for a free worker is recorded as
+        "executor_wait".
+
+        Raises:
+            ServiceOverloadedError: If all workers are busy and the queue is full
+        """
+        # Slots are taken on the event loop thread and released by the pool
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                MODEL_EXECUTOR_REJECTED.inc()
+                raise ServiceOverloadedError(
+                    f"Model executor saturated ({self._in_flight} requests in flight)",
+                    retry_after=self.retry_after,
+                )
+            self._in_flight += 1
+
+        context = contextvars.copy_context()
+        call = functools.partial(func, *args, **kwargs)
+        submitted = time.perf_counter()
+
+        def run_in_context():
+            record_span("executor_wait", (time.perf_counter() - submitted) * 1000)
+            return call()
+
+        try:
+            future = self._get_pool().submit(context.run, run_in_context)
+        except BaseException:
+            self._release()
+            raise
+        # Released when the call finishes (or is cancelled before it
+        # started), not when the awaiting coroutine goes away
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, _future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Get the executor counters."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker threads after the running calls finish."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+            logger.info("✓ Model executor shut down")
+
+
+# Global executor shared by the model endpoints
+model_executor = ModelExecutor(
+    max_workers=settings.model_executor_workers,
+    max_queue=settings.model_executor_max_queue,
+    retry_after=settings.model_executor_retry_after_seconds,
+)
@@ -0,0 +1,330 @@
+"""In-process Prometheus metrics (counters, gauges, histograms).
+
+A small dependency-free implementation of the Prometheus text exposition
+format. Recording is a dictionary lookup and a few additions under a
+per-metric lock, cheap enough for every request and model stage.
+
+Metrics are per process: with several gunicorn workers, each worker serves
+its own values on /metrics.
+"""
+
+import bisect
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from 10 microseconds (career encoding) to
+# 10 seconds (CLIP on large images)
+DEFAULT_BUCKETS = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric:
+    """Base class holding the name, help text and label names."""
+
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, Tuple[str, ...], Tuple[str, ...], float]]:
+        """Yield (suffix, label names, label values, value) tuples."""
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render the metric in the text exposition format."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for suffix, names, values, value in self.samples():
+            lines.append(
+                f"{self.name}{suffix}{_format_labels(names, values)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count, e.g. requests served."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Metrics without labels are exported as 0 before their first update
+        self._values: Dict[Tuple[str, ...], float] = (
+            {} if self.labelnames else {(): 0.0}
+        )
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """Add to the count of the given label values."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield "", self.labelnames, key, value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, e.g. a queue depth."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        # Metrics without labels are exported as 0 before their first update
+        self._values: Dict[Tuple[str, ...], float] = (
+            {} if self.labelnames else {(): 0.0}
+        )
+
+    def set(self, value: float, **labels) -> None:
+        """Set the value of the given label values."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield "", self.labelnames, key, value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values (latencies) in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label values: [count per bucket (+Inf last), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        """Record one observation for the given label values."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            ]
+        names = self.labelnames + ("le",)
+        for key, counts, total in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", names, key + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, key, total
+            yield "_count", self.labelnames, key, cumulative
+
+
+class MetricsRegistry:
+    """Creates metrics and renders all of them for /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register a counter."""
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        """Create and register a gauge."""
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry and the metrics recorded by the app
+metrics = MetricsRegistry()
+
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total",
+    "HTTP requests by method, route and status code",
+    ("method", "route", "status"),
+)
+HTTP_REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route",
+    ("method", "route"),
+)
+CAREER_STAGE_SECONDS = metrics.histogram(
+    "career_stage_seconds",
+    "Career prediction time per stage (parse, encode, scale, forest_predict, "
+    "tree_confidence) and call kind (single or batch)",
+    ("stage", "kind"),
+)
+CLIP_STAGE_SECONDS = metrics.histogram(
+    "clip_stage_seconds",
+    "CLIP comparison time per stage (decode, preprocess, encode_image, extract, "
+    "and each metric: clip, ssim, edge, histogram)",
+    ("stage",),
+)
+MODEL_EXECUTOR_IN_FLIGHT = metrics.gauge(
+    "model_executor_in_flight", "Model calls running or queued"
+)
+MODEL_EXECUTOR_QUEUE_DEPTH = metrics.gauge(
+    "model_executor_queue_depth", "Model calls waiting for a worker thread"
+)
+MODEL_EXECUTOR_REJECTED = metrics.counter(
+    "model_executor_rejected_total",
+    "Model calls rejected because the queue was full",
+)
+CLIP_BATCHER_QUEUE_DEPTH = metrics.gauge(
+    "clip_batcher_queue_depth", "Images waiting for the CLIP micro-batcher"
+)
+CLIP_BATCHER_BATCHES = metrics.counter(
+    "clip_batcher_batches_total", "Forward passes run by the CLIP micro-batcher"
+)
+CLIP_BATCHER_IMAGES = metrics.counter(
+    "clip_batcher_images_total",
+    "Images encoded by the CLIP micro-batcher (divide by batches for the "
+    "mean batch size)",
+)
+MODEL_LOAD_SECONDS = metrics.gauge(
+    "model_load_seconds", "Time taken to load each model", ("model",)
+)
+MODEL_READY = metrics.gauge(
+    "model_ready", "Whether each model is loaded (1) or not (0)", ("model",)
+)
+
+
+def observe_stages(
+    histogram: Histogram, timings_ms: Dict[str, float], **labels
+) -> None:
+    """Record a dictionary of stage wall times (in milliseconds) in seconds."""
+    for stage, elapsed in timings_ms.items():
+        histogram.observe(elapsed / 1000.0, stage=stage, **labels)
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware counting HTTP requests and timing them per route.
+
+    Requests are labelled with the route template (e.g.
+    ``/api/v1/career/predict``), not the raw path, so unknown URLs cannot
+    grow the label set; unmatched requests are labelled "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            route_path: Optional[str] = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=status["code"])
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, method=method, route=route_path
+            )
@@ -0,0 +1,95 @@
+"""Per-request stage timings reported in the Server-Timing header.
+
+``ServerTimingMiddleware`` gives every request a span recorder (a dict of
+stage name to milliseconds) held in a context variable. The services add
+the stage times they already measure with ``record_spans``; the model
+executor copies the context into its worker threads, so spans recorded
+there land in the request's recorder. The middleware then sends them as
+
+    Server-Timing: executor_wait;dur=0.041, career.parse;dur=0.012, ...
+
+Outside a request (or with the middleware disabled) recording is a single
+context variable lookup.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from starlette.datastructures import MutableHeaders
+
+_spans: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "server_timing_spans", default=None
+)
+
+
+def record_span(name: str, elapsed_ms: float) -> None:
+    """Add a wall time (in milliseconds) to a span of the current request."""
+    spans = _spans.get()
+    if spans is not None:
+        spans[name] = spans.get(name, 0.0) + elapsed_ms
+
+
+def record_spans(timings_ms: Dict[str, float], prefix: str) -> None:
+    """Add a dictionary of stage wall times as ``<prefix>.<stage>`` spans."""
+    spans = _spans.get()
+    if spans is not None:
+        for stage, elapsed in timings_ms.items():
+            name = f"{prefix}.{stage}"
+            spans[name] = spans.get(name, 0.0) + elapsed
+
+
+def request_timings(prefix: str) -> Optional[Dict[str, float]]:
+    """Get the spans recorded so far, or None outside a request.
+
+    Spans of the given service are named by their stage alone (e.g.
+    "decode" for "clip.decode"); other spans such as "executor_wait" keep
+    their name.
+    """
+    spans = _spans.get()
+    if spans is None:
+        return None
+    start = len(prefix) + 1
+    return {
+        (name[start:] if name.startswith(f"{prefix}.") else name): round(elapsed, 3)
+        for name, elapsed in spans.items()
+    }
+
+
+def server_timing_header(spans: Dict[str, float], total_ms: float) -> str:
+    """Format spans and the total request time as a Server-Timing value."""
+    entries = [f"{name};dur={elapsed:.3f}" for name, elapsed in spans.items()]
+    entries.append(f"total;dur={total_ms:.3f}")
+    return ", ".join(entries)
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding a Server-Timing header to every response.
+
+    The "total" span is the time from receiving the request to sending the
+    response headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        spans: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", server_timing_header(spans, total_ms))
+            await send(message)
+
+        token = _spans.set(spans)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _spans.reset(token)
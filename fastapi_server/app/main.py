@@ -1,47 +1,81 @@
 """FastAPI application for career recommendation and CLIP image comparison."""
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
 from app.core.logging import setup_logging, get_logger
-from app.api.v1 import health, career, clip
+from app.core.exceptions import ModelNotLoadedError, ServiceOverloadedError
+from app.core.executor import model_executor
+from app.core.metrics import RequestMetricsMiddleware
+from app.core.timing import ServerTimingMiddleware
+from app.api.v1 import health, career, clip, metrics
+from app.services.loader import career_loader, clip_loader
 
 # Setup logging
 setup_logging()
 logger = get_logger(__name__)
 
 
+async def _load_clip():
+    """Load CLIP in the background, then start the micro-batcher."""
+    clip_service = await clip_loader.load_until_ready()
+    if clip_service is not None and settings.clip_batching_enabled:
+        try:
+            await clip_service.start_batcher()
+        except Exception as e:
+            logger.error(f"Error starting CLIP batcher: {str(e)}")
+
+
+async def _follow_career_model_version():
+    """Pick up career model reloads published by other workers while idle."""
+    while True:
+        await asyncio.sleep(settings.career_model_sync_seconds)
+        career_predictor = career_loader.peek()
+        if career_predictor is not None:
+            try:
+                await asyncio.to_thread(career_predictor.sync_active_version)
+            except Exception as e:
+                logger.error(f"Error syncing career model version: {str(e)}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown events."""
     # Startup
     logger.info("Starting Career Recommendation & CLIP API...")
     
-    try:
-        # Import services to trigger model loading
-        from app.services.career_service import career_predictor
-        from app.services.clip_service import clip_service
-        
-        # Check if models loaded successfully
-        if career_predictor.is_loaded():
-            logger.info("✓ Career model loaded successfully")
-        else:
-            logger.warning("✗ Career model failed to load")
-        
-        if clip_service.is_loaded():
-            logger.info("✓ CLIP model loaded successfully")
-        else:
-            logger.warning("✗ CLIP model failed to load")
-            
-    except Exception as e:
-        logger.error(f"Error during startup: {str(e)}")
-        # Don't raise - allow API to start even if models fail
+    # Load the models of the enabled subsystems in the background so the
+    # server binds immediately; /health answers right away and /ready reports
+    # each model. Career loading does not wait for CLIP. Failed loads are
+    # retried every model_load_retry_seconds.
+    app.state.model_loading = []
+    if settings.enable_career:
+        app.state.model_loading.append(
+            asyncio.create_task(career_loader.load_until_ready())
+        )
+        app.state.model_sync = asyncio.create_task(_follow_career_model_version())
+    if settings.enable_clip:
+        app.state.model_loading.append(asyncio.create_task(_load_clip()))
     
     yield
     
     # Shutdown
     logger.info("Shutting down Career Recommendation & CLIP API...")
+    for task in app.state.model_loading:
+        task.cancel()
+    if settings.enable_career:
+        app.state.model_sync.cancel()
+    clip_service = clip_loader.peek()
+    if clip_service is not None:
+        try:
+            await clip_service.stop_batcher()
+            clip_service.shutdown()
+        except Exception as e:
+            logger.error(f"Error stopping CLIP service: {str(e)}")
+    model_executor.shutdown()
 
 
 # Create FastAPI app
@@ -61,26 +95,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
+# Count and time every request per route
+if settings.metrics_enabled:
+    app.add_middleware(RequestMetricsMiddleware)
+
+# Report each request's stage times in a Server-Timing header
+if settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+
+@app.exception_handler(ModelNotLoadedError)
+async def model_not_loaded_handler(request: Request, exc: ModelNotLoadedError):
+    """Answer 503 while a model is still loading (or failed to load)."""
+    return JSONResponse(status_code=503, content={"detail": f"Model not loaded: {str(exc)}"})
+
+
+@app.exception_handler(ServiceOverloadedError)
+async def service_overloaded_handler(request: Request, exc: ServiceOverloadedError):
+    """Answer 503 with a Retry-After hint when the model executor is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+
+# Include routers (only for the enabled subsystems)
 app.include_router(health.router)
-app.include_router(career.router, prefix="/api/v1")
-app.include_router(clip.router, prefix="/api/v1")
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
+if settings.enable_career:
+    app.include_router(career.router, prefix="/api/v1")
+if settings.enable_clip:
+    app.include_router(clip.router, prefix="/api/v1")
 
 
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint."""
-    return {
+    endpoints = {}
+    if settings.enable_career:
+        endpoints.update({
+            "career_predict": "/api/v1/career/predict",
+            "career_predict_batch": "/api/v1/career/predict/batch",
+            "career_info": "/api/v1/career/info"
+        })
+    if settings.enable_clip:
+        endpoints.update({
+            "clip_compare": "/api/v1/clip/compare",
+            "clip_references": "/api/v1/clip/references",
+            "clip_compare_reference": "/api/v1/clip/compare/reference"
+        })
+    
+    response = {
         "message": "Career Recommendation & CLIP API",
         "version": settings.app_version,
         "docs": "/docs",
         "health": "/health",
-        "endpoints": {
-            "career_predict": "/api/v1/career/predict",
-            "career_info": "/api/v1/career/info",
-            "clip_compare": "/api/v1/clip/compare"
-        }
+        "ready": "/ready",
+        "endpoints": endpoints
     }
+    if settings.metrics_enabled:
+        response["metrics"] = "/metrics"
+    return response
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 """Pydantic models for career prediction request and response validation."""
 
-from typing import List
+from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -67,8 +67,17 @@ class CareerRecommendation(BaseModel):
     top_predictions: List[CoursePrediction] = Field(
         ..., description="Top 3 course predictions with probabilities"
     )
+    model_version: Optional[str] = Field(
+        None, description="Version of the models that made the prediction"
+    )
+    timings_ms: Optional[Dict[str, float]] = Field(
+        None,
+        description="Wall time of each stage in ms, including the wait for a "
+        "model worker (only when detailed=true and Server-Timing is enabled)",
+    )
 
     model_config = {
+        "protected_namespaces": (),
         "json_schema_extra": {
             "examples": [
                 {
@@ -79,12 +88,66 @@ class CareerRecommendation(BaseModel):
                         {"course": "B.Sc", "probability": 0.10},
                         {"course": "MCA", "probability": 0.05},
                     ],
+                    "model_version": "v1.0.0",
+                }
+            ]
+        },
+    }
+
+
+class CareerBatchInput(BaseModel):
+    """Input model for batch career prediction."""
+
+    items: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        description="CareerInput records; each item is validated independently",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "items": [
+                        {
+                            "gender": "Female",
+                            "interest": "Cloud computing, Technology",
+                            "skills": "Python, SQL, Java",
+                            "grades": 85.0,
+                        },
+                        {
+                            "gender": "Male",
+                            "interest": "Data analytics;Machine Learning",
+                            "skills": "Python;R;Machine Learning skills",
+                            "grades": 78.5,
+                        },
+                    ]
                 }
             ]
         }
     }
 
 
+class CareerBatchItemResult(BaseModel):
+    """Result for a single item of a batch prediction."""
+
+    index: int = Field(..., description="Position of the item in the request")
+    recommendation: Optional[CareerRecommendation] = Field(
+        None, description="Prediction for the item, if it succeeded"
+    )
+    error: Optional[str] = Field(None, description="Error message, if it failed")
+
+
+class CareerBatchResponse(BaseModel):
+    """Response model for batch career prediction."""
+
+    results: List[CareerBatchItemResult] = Field(
+        ..., description="Per-item results in request order"
+    )
+    succeeded: int = Field(..., description="Number of successful predictions")
+    failed: int = Field(..., description="Number of failed items")
+
+
 class CareerFeedback(CareerInput):
     """Model for submitting career prediction feedback."""
 
@@ -99,3 +162,36 @@ class CareerLists(BaseModel):
     interests: List[str] = Field(..., description="List of valid interests")
     skills: List[str] = Field(..., description="List of valid skills")
     courses: List[str] = Field(..., description="List of valid courses")
+
+
+class CareerModelReloadRequest(BaseModel):
+    """Request model for reloading the career models."""
+
+    version: Optional[str] = Field(
+        None, description="Model version to load (default: the newest version)"
+    )
+
+
+class CareerModelReloadStatus(BaseModel):
+    """Status of the last career model reload."""
+
+    status: str = Field(..., description="idle, loading, ready or failed")
+    version: Optional[str] = Field(None, description="Version being reloaded")
+    error: Optional[str] = Field(None, description="Reload error, if it failed")
+    load_seconds: Optional[float] = Field(None, description="Time taken to load")
+
+
+class CareerModelVersions(BaseModel):
+    """Response model for the career model registry."""
+
+    worker_pid: int = Field(..., description="Process id of the answering worker")
+    active_version: Optional[str] = Field(
+        None, description="Version published to all workers by the last reload"
+    )
+    serving_version: Optional[str] = Field(
+        ..., description="Version currently serving predictions"
+    )
+    versions: List[str] = Field(..., description="Available versions, oldest first")
+    reload: CareerModelReloadStatus = Field(
+        ..., description="Status of the last reload"
+    )
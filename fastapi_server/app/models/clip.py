@@ -1,5 +1,5 @@
 """Pydantic models for CLIP image comparison."""
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
 
 
@@ -26,14 +26,66 @@ class CLIPCompareResponse(BaseModel):
         description="Similarity score between the two images"
     )
     message: str = Field(default="Images compared successfully")
+    profile: Optional[str] = Field(None, description="Scoring profile used")
+    stages: Optional[List[List[str]]] = Field(
+        None,
+        description="Metric stages that ran, in order"
+    )
+    early_exit: Optional[bool] = Field(
+        None,
+        description="Whether the cascade stopped before computing every metric"
+    )
+    scores: Optional[Dict[str, float]] = Field(
+        None,
+        description="Individual metric scores (only when detailed=true)"
+    )
+    timings_ms: Optional[Dict[str, float]] = Field(
+        None,
+        description="Wall time of each stage and metric in ms, including the "
+        "wait for a model worker (only when detailed=true)"
+    )
     
     model_config = {
         "json_schema_extra": {
             "examples": [
                 {
                     "similarity": 0.87,
-                    "message": "Images compared successfully"
+                    "message": "Images compared successfully",
+                    "profile": "hybrid",
+                    "stages": [["histogram", "edge"]],
+                    "early_exit": True
+                }
+            ]
+        }
+    }
+
+
+class CLIPReferenceResponse(BaseModel):
+    """Response for a registered reference image."""
+    
+    reference_id: str = Field(..., description="Id to use with /clip/compare/reference")
+    filename: Optional[str] = Field(None, description="Original file name")
+    created_at: Optional[str] = Field(None, description="Registration time (ISO 8601)")
+    message: str = Field(default="Reference image registered successfully")
+    
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "reference_id": "3f1c9a6e0b7d4c2a8e5f1b3d6c9a0e7f2b4d8c1a",
+                    "filename": "apple_outline.png",
+                    "created_at": "2026-01-12T10:00:00+00:00",
+                    "message": "Reference image registered successfully"
                 }
             ]
         }
     }
+
+
+class CLIPProfilesResponse(BaseModel):
+    """Available hybrid scoring profiles."""
+    
+    default: str = Field(..., description="Profile used when none is requested")
+    profiles: Dict[str, Dict[str, float]] = Field(
+        ..., description="Metric weights of each profile"
+    )
@@ -1,4 +1,5 @@
 """Common models for request and response validation."""
+from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field
 
 
@@ -8,6 +9,30 @@ class HealthResponse(BaseModel):
     status: str = Field(..., description="Service status")
     model_loaded: bool = Field(..., description="Whether Career ML model is loaded")
     clip_loaded: bool = Field(default=False, description="Whether CLIP model is loaded")
+    career_cache: Optional[Dict[str, Any]] = Field(
+        None, description="Career prediction cache counters (hits, misses, evictions)"
+    )
+    clip_feature_cache: Optional[Dict[str, Any]] = Field(
+        None, description="CLIP image feature cache counters (hits, misses, bytes)"
+    )
+    model_executor: Optional[Dict[str, int]] = Field(
+        None, description="Model executor load (in flight, queue depth, rejected)"
+    )
+
+
+class ModelStatus(BaseModel):
+    """Loading status of one model."""
+    
+    status: str = Field(..., description="pending, loading, ready or failed")
+    error: Optional[str] = Field(None, description="Load error, if loading failed")
+    load_seconds: Optional[float] = Field(None, description="Time taken to load")
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness check response."""
+    
+    ready: bool = Field(..., description="Whether every enabled model is loaded")
+    models: Dict[str, ModelStatus] = Field(..., description="Status of each enabled model")
 
 
 class ErrorResponse(BaseModel):
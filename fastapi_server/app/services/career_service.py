@@ -1,20 +1,43 @@
 """Career predictor service for loading models and making predictions."""
 
 # Trigger reload to load new encoder files - mlb_interest.pkl and mlb_skills.pkl
-import joblib
+import os
+import threading
+import time
 import numpy as np
-from pathlib import Path
-from typing import Dict, List
-from sklearn.preprocessing import MultiLabelBinarizer, LabelEncoder, StandardScaler
-from sklearn.ensemble import RandomForestRegressor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
 
 from app.config import settings
 from app.core.logging import get_logger
+from app.core.cache import LRUCache
 from app.core.exceptions import ModelNotLoadedError, PredictionError
+from app.core.metrics import CAREER_STAGE_SECONDS, observe_stages
+from app.core.timing import record_spans
+from app.services.feature_encoder import FeatureEncoder
+from app.services.forest_engine import ForestEngine, build_forest_engine
+from app.services.model_bundle import is_bundle, load_bundle
+from app.services.model_registry import ModelRegistry
 
 logger = get_logger(__name__)
 
 
+@dataclass
+class CareerModels:
+    """One loaded and validated version of the career models.
+
+    Requests take a reference to the bundle once and use it throughout, so a
+    reload swapping in a new bundle never mixes two versions in one
+    prediction.
+    """
+
+    version: str
+    forest_engine: ForestEngine
+    feature_encoder: FeatureEncoder
+    course_mapping: Dict[int, str]
+    source: str  # "bundle" or "pickle"
+
+
 class CareerPredictor:
     """Handles model loading and career predictions."""
 
@@ -32,74 +55,296 @@ class CareerPredictor:
         if self._initialized:
             return
 
-        self.model: RandomForestRegressor = None
-        self.scaler: StandardScaler = None
-        self.gender_encoder: LabelEncoder = None
-        self.interest_encoder: MultiLabelBinarizer = None
-        self.skills_encoder: MultiLabelBinarizer = None
-        self._load_models()
+        self.registry = ModelRegistry(
+            settings.models_dir, settings.career_default_model_version
+        )
+        self.models: Optional[CareerModels] = None
+        self.reload_state: Dict = {
+            "status": "idle",
+            "version": None,
+            "error": None,
+            "load_seconds": None,
+        }
+        self._reload_lock = threading.Lock()
+        # Active version marker last acted on, and when to look at it again
+        self._seen_marker = self.registry.active_version_stamp()
+        self._next_sync = 0.0
+        self.cache: Optional[LRUCache] = (
+            LRUCache(
+                max_entries=settings.career_cache_max_entries,
+                ttl_seconds=settings.career_cache_ttl_seconds,
+            )
+            if settings.career_cache_enabled
+            else None
+        )
+        # A published reload wins over the configured startup version, so a
+        # restarted worker serves the same version as the others
+        version = (
+            self.registry.active_version()
+            or settings.career_model_version
+            or self.registry.latest()
+        )
+        if version is None:
+            raise ModelNotLoadedError(
+                f"No career models found in {settings.models_dir}"
+            )
+        self.models = self._load_models(version)
         self._initialized = True
 
-    def _load_models(self):
-        """Load the trained models from disk."""
+    @property
+    def version(self) -> Optional[str]:
+        """Version of the models currently serving predictions."""
+        models = self.models
+        return models.version if models is not None else None
+
+    def _load_models(self, version: str) -> CareerModels:
+        """Load and validate one version of the trained models from disk."""
         try:
-            # Load Random Forest model
-            rf_path = settings.model_paths["random_forest"]
-            if not rf_path.exists():
-                raise FileNotFoundError(f"Model file not found: {rf_path}")
-            self.model = joblib.load(rf_path)
-            logger.info(f"✓ Loaded Random Forest model from {rf_path}")
-
-            # Load Standard Scaler
-            scaler_path = settings.model_paths["scaler"]
-            if not scaler_path.exists():
-                raise FileNotFoundError(f"Scaler file not found: {scaler_path}")
-            self.scaler = joblib.load(scaler_path)
-            logger.info(f"✓ Loaded Standard Scaler from {scaler_path}")
-
-            # Gender encoder: NOT saved during training (le.pkl was overwritten with course labels)
-            # Always initialize fresh
-            self._initialize_gender_encoder()
-
-            # MultiLabelBinarizer: Load the properly fitted encoders
-            # (created from actual training data to match exact feature counts)
-            mlb_interest_path = settings.models_dir / "mlb_interest.pkl"
-            mlb_skills_path = settings.models_dir / "mlb_skills.pkl"
-
-            if mlb_interest_path.exists() and mlb_skills_path.exists():
-                self.interest_encoder = joblib.load(mlb_interest_path)
-                self.skills_encoder = joblib.load(mlb_skills_path)
-                logger.info(
-                    f"✓ Loaded MultiLabelBinarizers ({len(self.interest_encoder.classes_)} interests, {len(self.skills_encoder.classes_)} skills)"
-                )
+            model_paths = self.registry.model_paths(version)
+            if (
+                settings.career_model_bundle
+                and settings.career_forest_engine == "flat"
+                and is_bundle(model_paths["bundle"])
+            ):
+                models = self._load_bundle(model_paths, version)
             else:
-                logger.warning(
-                    "MLB encoders not found, initializing with settings (may cause feature mismatch)"
-                )
-                self._initialize_mlb_encoders()
+                models = self._load_pickled_models(model_paths, version)
+            self._validate_models(models)
+            logger.info(f"✓ Loaded career models {version} ({models.source})")
+            return models
 
         except Exception as e:
             logger.error(f"Error loading models: {str(e)}")
             raise ModelNotLoadedError(f"Error loading models: {str(e)}")
 
+    def _load_bundle(self, model_paths: Dict, version: str) -> CareerModels:
+        """Open the memory-mapped model bundle of a version (no unpickling)."""
+        feature_encoder, forest_engine, course_mapping, _ = load_bundle(
+            model_paths["bundle"]
+        )
+        return CareerModels(
+            version=version,
+            forest_engine=forest_engine,
+            feature_encoder=feature_encoder,
+            course_mapping=course_mapping,
+            source="bundle",
+        )
+
+    def _load_pickled_models(self, model_paths: Dict, version: str) -> CareerModels:
+        """Unpickle the joblib model files of a version."""
+        # Only this path needs joblib/sklearn; bundles are loaded without them
+        import joblib
+
+        # Load Random Forest model (plain forest or the grid-search artifact)
+        rf_path = model_paths["random_forest"]
+        if not rf_path.exists():
+            rf_path = model_paths["random_forest_grid"]
+        if not rf_path.exists():
+            raise FileNotFoundError(f"Model file not found: {rf_path}")
+        model = joblib.load(rf_path)
+        logger.info(f"✓ Loaded Random Forest model from {rf_path}")
+        forest_engine = build_forest_engine(
+            model,
+            kind=settings.career_forest_engine,
+            n_codes=len(settings.course_mapping),
+        )
+
+        # Load Standard Scaler
+        scaler_path = model_paths["scaler"]
+        if not scaler_path.exists():
+            raise FileNotFoundError(f"Scaler file not found: {scaler_path}")
+        scaler = joblib.load(scaler_path)
+        logger.info(f"✓ Loaded Standard Scaler from {scaler_path}")
+
+        # Gender encoder: NOT saved during training (le.pkl was overwritten with course labels)
+        # Always initialize fresh
+        gender_encoder = self._initialize_gender_encoder()
+
+        # MultiLabelBinarizer: Load the properly fitted encoders
+        # (created from actual training data to match exact feature counts)
+        mlb_interest_path = model_paths["mlb_interest"]
+        mlb_skills_path = model_paths["mlb_skills"]
+
+        if mlb_interest_path.exists() and mlb_skills_path.exists():
+            interest_encoder = joblib.load(mlb_interest_path)
+            skills_encoder = joblib.load(mlb_skills_path)
+            logger.info(
+                f"✓ Loaded MultiLabelBinarizers ({len(interest_encoder.classes_)} interests, {len(skills_encoder.classes_)} skills)"
+            )
+        else:
+            logger.warning(
+                "MLB encoders not found, initializing with settings (may cause feature mismatch)"
+            )
+            interest_encoder, skills_encoder = self._initialize_mlb_encoders()
+
+        # Lookup tables used on the request path instead of the sklearn
+        # transforms above
+        feature_encoder = FeatureEncoder.from_sklearn(
+            gender_encoder,
+            interest_encoder,
+            skills_encoder,
+            scaler,
+        )
+        return CareerModels(
+            version=version,
+            forest_engine=forest_engine,
+            feature_encoder=feature_encoder,
+            course_mapping=dict(settings.course_mapping),
+            source="pickle",
+        )
+
+    def _validate_models(self, models: CareerModels):
+        """
+        Check that a freshly loaded model version can serve predictions.
+
+        The encoders must produce exactly the feature count the forest was
+        trained on, and a sample profile must score to a finite estimate.
+        """
+        n_features = models.feature_encoder.n_features
+        if n_features != models.forest_engine.n_features:
+            raise ValueError(
+                f"Encoders produce {n_features} features, "
+                f"model expects {models.forest_engine.n_features}"
+            )
+
+        sample = models.feature_encoder.transform(
+            [
+                {
+                    "gender": models.feature_encoder.gender_classes[0],
+                    "interest_tokens": (),
+                    "skill_tokens": (),
+                    "grades": 75.0,
+                }
+            ]
+        )
+        ensemble = models.forest_engine.evaluate(sample)
+        if not np.all(np.isfinite(ensemble.point_estimates)):
+            raise ValueError("Model produced a non-finite prediction")
+
+    def request_reload(self, version: str) -> bool:
+        """
+        Mark a reload of the given version as started.
+
+        Returns:
+            False if another reload is still running
+        """
+        with self._reload_lock:
+            if self.reload_state["status"] == "loading":
+                return False
+            self.reload_state = {
+                "status": "loading",
+                "version": version,
+                "error": None,
+                "load_seconds": None,
+            }
+            return True
+
+    def reload(self, version: str, publish: bool = True):
+        """
+        Load, validate and swap in a model version (blocking).
+
+        Call request_reload first. The new models are built next to the
+        serving ones; requests already running finish on the models they
+        started with, later requests use the new version. If loading or
+        validation fails, the serving version is kept.
+
+        Once swapped in, the version is published in the registry's active
+        version marker; the other worker processes pick it up on their next
+        sync (see sync_active_version).
+
+        Args:
+            version: Registry version to serve
+            publish: Write the active version marker (False when following
+                a marker written by another worker)
+        """
+        start = time.perf_counter()
+        try:
+            models = self._load_models(version)
+        except Exception as e:
+            self.reload_state.update(
+                status="failed",
+                error=str(e),
+                load_seconds=time.perf_counter() - start,
+            )
+            logger.error(f"✗ Reload of career models {version} failed: {str(e)}")
+            return
+
+        previous = self.version
+        self.models = models
+        # Entries are keyed by version; drop the ones of the previous models
+        if self.cache is not None:
+            self.cache.clear()
+        self.reload_state.update(
+            status="ready", load_seconds=time.perf_counter() - start
+        )
+        logger.info(f"✓ Swapped career models {previous} -> {version}")
+
+        if publish:
+            try:
+                self.registry.set_active_version(version)
+                self._seen_marker = self.registry.active_version_stamp()
+            except OSError as e:
+                self.reload_state["error"] = (
+                    f"Loaded in worker {os.getpid()} only, could not publish "
+                    f"the version to the other workers: {str(e)}"
+                )
+                logger.error(f"✗ Could not write the active version marker: {str(e)}")
+
+    def sync_active_version(self):
+        """
+        Follow a reload published by another worker process.
+
+        Called before each prediction and periodically by the app. At most
+        every ``career_model_sync_seconds``, compares the registry's
+        active version marker with the one last seen; when it names another
+        version, that version is loaded in the background (requests keep
+        using the current models meanwhile). A marker whose version failed
+        to load is not retried until it changes.
+        """
+        now = time.monotonic()
+        if now < self._next_sync:
+            return
+        self._next_sync = now + settings.career_model_sync_seconds
+
+        marker = self.registry.active_version_stamp()
+        if marker is None or marker == self._seen_marker:
+            return
+        self._seen_marker = marker
+        version = marker[1]
+        if version != self.version and self.request_reload(version):
+            logger.info(f"Following published career models {version}")
+            threading.Thread(
+                target=self.reload,
+                args=(version,),
+                kwargs={"publish": False},
+                name="career-model-sync",
+                daemon=True,
+            ).start()
+
     def _initialize_gender_encoder(self):
         """Initialize gender encoder to match training data."""
-        self.gender_encoder = LabelEncoder()
+        from sklearn.preprocessing import LabelEncoder
+
+        gender_encoder = LabelEncoder()
         # Fit with classes in the same order as training (alphabetical: Female, Male)
-        self.gender_encoder.fit(["Female", "Male"])
+        gender_encoder.fit(["Female", "Male"])
         logger.info("✓ Initialized gender encoder with classes: ['Female', 'Male']")
+        return gender_encoder
 
     def _initialize_mlb_encoders(self):
         """Initialize MultiLabelBinarizer encoders (fallback if not loaded from file)."""
+        from sklearn.preprocessing import MultiLabelBinarizer
+
         # Interest encoder - fit on all valid interests
-        self.interest_encoder = MultiLabelBinarizer()
-        self.interest_encoder.fit([settings.valid_interests])
+        interest_encoder = MultiLabelBinarizer()
+        interest_encoder.fit([settings.valid_interests])
 
         # Skills encoder - fit on all valid skills
-        self.skills_encoder = MultiLabelBinarizer()
-        self.skills_encoder.fit([settings.valid_skills])
+        skills_encoder = MultiLabelBinarizer()
+        skills_encoder.fit([settings.valid_skills])
 
         logger.info("✓ Initialized interest and skills encoders")
+        return interest_encoder, skills_encoder
 
     def _parse_text_list(self, text: str) -> List[str]:
         """Parse comma/semicolon separated text into list of lowercase items."""
@@ -108,41 +353,179 @@ class CareerPredictor:
         # Clean and lowercase each item
         return [item.lower().strip() for item in items if item.strip()]
 
-    def _preprocess_input(
+    def _normalize_profile(
         self, gender: str, interest: str, skills: str, grades: float
-    ) -> np.ndarray:
-        """Preprocess input data to match training format."""
-        try:
-            # Encode gender
-            gender_encoded = self.gender_encoder.transform([gender])[0]
+    ) -> Dict:
+        """
+        Build the canonical form of an input profile.
 
-            # Parse and encode interests
-            interest_list = self._parse_text_list(interest)
-            interest_encoded = self.interest_encoder.transform([interest_list])[0]
+        Interests and skills become sorted, deduplicated token tuples (the
+        multi-hot encoding does not depend on order or repeats). Grades are
+        kept as given; only the cache key rounds them.
 
-            # Parse and encode skills
-            skills_list = self._parse_text_list(skills)
-            skills_encoded = self.skills_encoder.transform([skills_list])[0]
+        Returns:
+            Dictionary with gender, interest_tokens, skill_tokens and grades
+        """
+        return {
+            "gender": gender,
+            "interest_tokens": tuple(sorted(set(self._parse_text_list(interest)))),
+            "skill_tokens": tuple(sorted(set(self._parse_text_list(skills)))),
+            "grades": grades,
+        }
+
+    def _profile_key(self, profile: Dict, models: CareerModels) -> Tuple:
+        """
+        Get the cache key of a normalized profile for a model version.
+
+        Grades are rounded to ``career_cache_grade_decimals`` so that nearly
+        equal profiles share an entry; the model itself always scores the
+        exact grade of the profile that missed the cache.
+        """
+        return (
+            models.version,
+            profile["gender"],
+            profile["interest_tokens"],
+            profile["skill_tokens"],
+            round(profile["grades"], settings.career_cache_grade_decimals),
+        )
 
-            # Combine all features
-            # Order: gender, grades, interest features, skill features
-            features = np.concatenate(
-                [[gender_encoded], [grades], interest_encoded, skills_encoded]
+    @staticmethod
+    def _record_stage(timings: Dict[str, float], stage: str, start: float) -> float:
+        """Add the milliseconds elapsed since start to a stage; return now."""
+        now = time.perf_counter()
+        timings[stage] = timings.get(stage, 0.0) + (now - start) * 1000
+        return now
+
+    def _preprocess_input(
+        self, profile: Dict, models: CareerModels, timings: Dict[str, float]
+    ) -> np.ndarray:
+        """Preprocess a normalized profile to match training format."""
+        try:
+            start = time.perf_counter()
+            encoder = models.feature_encoder
+            features = encoder.encode_one(
+                profile["gender"],
+                profile["interest_tokens"],
+                profile["skill_tokens"],
+                profile["grades"],
             )
+            start = self._record_stage(timings, "encode", start)
+            features = encoder.apply_scaling(features)
+            self._record_stage(timings, "scale", start)
+            return features
+        except Exception as e:
+            logger.error(f"Error preprocessing input: {str(e)}")
+            raise PredictionError(f"Error preprocessing input: {str(e)}")
 
-            # Reshape for scaling
-            features = features.reshape(1, -1)
+    def _preprocess_batch(
+        self, profiles: List[Dict], models: CareerModels, timings: Dict[str, float]
+    ) -> np.ndarray:
+        """
+        Preprocess a batch of normalized profiles into one scaled feature matrix.
 
-            # Apply standard scaling
-            features_scaled = self.scaler.transform(features)
+        Args:
+            profiles: Profiles built by _normalize_profile
+            models: Models the rows will be scored with
+            timings: Dictionary accumulating the "encode" and "scale" wall
+                times in milliseconds
 
-            return features_scaled
+        Returns:
+            Scaled feature matrix with one row per profile
+        """
+        try:
+            start = time.perf_counter()
+            features = models.feature_encoder.encode(profiles)
+            start = self._record_stage(timings, "encode", start)
+            features = models.feature_encoder.apply_scaling(features)
+            self._record_stage(timings, "scale", start)
+            return features
         except Exception as e:
             logger.error(f"Error preprocessing input: {str(e)}")
-            if hasattr(self.scaler, "n_features_in_"):
-                logger.error(f"Expected {self.scaler.n_features_in_} features")
             raise PredictionError(f"Error preprocessing input: {str(e)}")
 
+    def _summarize_prediction(
+        self,
+        point_estimate: float,
+        confidence: float,
+        top_codes: np.ndarray,
+        top_probabilities: np.ndarray,
+        models: CareerModels,
+    ) -> Dict:
+        """
+        Build the recommendation for one row from the ensemble outputs.
+
+        Args:
+            point_estimate: Forest (mean) prediction for the row
+            confidence: Confidence derived from the spread of tree outputs
+            top_codes: Most voted course codes, best first
+            top_probabilities: Share of trees voting for each of top_codes
+            models: Models that produced the outputs
+
+        Returns:
+            Dictionary with predicted course and confidence scores
+        """
+        # Round to nearest integer (course code)
+        predicted_course_code = int(round(point_estimate))
+
+        # Ensure the predicted code is within valid range
+        if predicted_course_code < 0:
+            predicted_course_code = 0
+        elif predicted_course_code >= len(models.course_mapping):
+            predicted_course_code = len(models.course_mapping) - 1
+
+        # Get course name
+        predicted_course = models.course_mapping.get(predicted_course_code, "Unknown")
+
+        top_courses = [
+            {
+                "course": models.course_mapping[int(course_code)],
+                "probability": float(probability),
+            }
+            for course_code, probability in zip(top_codes, top_probabilities)
+            if probability > 0
+        ]
+
+        # Ensure we have at least 3 predictions
+        while len(top_courses) < 3:
+            top_courses.append({"course": "N/A", "probability": 0.0})
+
+        return {
+            "predicted_course": predicted_course,
+            "confidence": float(confidence),
+            "top_predictions": top_courses[:3],
+            "model_version": models.version,
+        }
+
+    def _predict_features(
+        self, features: np.ndarray, models: CareerModels, timings: Dict[str, float]
+    ) -> List[Dict]:
+        """
+        Score a preprocessed feature matrix and summarize every row.
+
+        The tree traversal is timed as "forest_predict"; the mean, confidence,
+        vote histogram and response building as "tree_confidence".
+        """
+        start = time.perf_counter()
+        outputs = models.forest_engine.tree_outputs(features)
+        start = self._record_stage(timings, "forest_predict", start)
+
+        # Mean, confidence and vote histogram from the per-tree outputs
+        ensemble = models.forest_engine.summarize(outputs)
+        top_codes, top_probabilities = ensemble.top_votes(3)
+
+        summaries = [
+            self._summarize_prediction(
+                ensemble.point_estimates[i],
+                ensemble.confidence[i],
+                top_codes[i],
+                top_probabilities[i],
+                models,
+            )
+            for i in range(features.shape[0])
+        ]
+        self._record_stage(timings, "tree_confidence", start)
+        return summaries
+
     def predict(self, gender: str, interest: str, skills: str, grades: float) -> Dict:
         """
         Make career prediction based on input features.
@@ -154,83 +537,142 @@ class CareerPredictor:
             grades: CGPA or percentage
 
         Returns:
-            Dictionary with predicted course and confidence scores
+            Dictionary with predicted course, confidence scores and the
+            version of the models that produced it
         """
-        if not self.is_loaded():
+        self.sync_active_version()
+        # One version serves the whole request, even if a reload swaps it
+        models = self.models
+        if models is None:
             raise ModelNotLoadedError("Models not loaded properly")
 
+        timings: Dict[str, float] = {}
         try:
+            start = time.perf_counter()
+            profile = self._normalize_profile(gender, interest, skills, grades)
+            self._record_stage(timings, "parse", start)
+
+            # Identical profiles are answered from the cache
+            if self.cache is not None:
+                key = self._profile_key(profile, models)
+                cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+
             # Preprocess input
-            features = self._preprocess_input(gender, interest, skills, grades)
+            features = self._preprocess_input(profile, models, timings)
+            result = self._predict_features(features, models, timings)[0]
 
-            # Make prediction
-            predicted_course_code = self.model.predict(features)[0]
+            if self.cache is not None:
+                self.cache.put(key, result)
+            return result
+        except PredictionError:
+            raise
+        except Exception as e:
+            logger.error(f"Prediction error: {str(e)}")
+            raise PredictionError(f"Prediction failed: {str(e)}")
+        finally:
+            observe_stages(CAREER_STAGE_SECONDS, timings, kind="single")
+            record_spans(timings, prefix="career")
 
-            # Round to nearest integer (course code)
-            predicted_course_code = int(round(predicted_course_code))
+    def predict_batch(self, records: List[Dict]) -> List[Dict]:
+        """
+        Make career predictions for many inputs in one matrix pass.
 
-            # Ensure the predicted code is within valid range
-            if predicted_course_code < 0:
-                predicted_course_code = 0
-            elif predicted_course_code >= len(settings.course_mapping):
-                predicted_course_code = len(settings.course_mapping) - 1
+        Rows that cannot be encoded (e.g. an unknown gender) are reported
+        individually instead of failing the whole batch.
 
-            # Get course name
-            predicted_course = settings.course_mapping.get(
-                predicted_course_code, "Unknown"
-            )
+        Args:
+            records: Dictionaries with gender, interest, skills and grades
+
+        Returns:
+            One dictionary per record, in order, holding either a
+            "prediction" (same shape as predict()) or an "error" message
+        """
+        self.sync_active_version()
+        models = self.models
+        if models is None:
+            raise ModelNotLoadedError("Models not loaded properly")
 
-            # For Random Forest, we can get prediction probabilities from trees
-            # Get predictions from all trees
-            tree_predictions = np.array(
-                [tree.predict(features)[0] for tree in self.model.estimators_]
+        results: List[Dict] = [{"prediction": None, "error": None} for _ in records]
+        timings: Dict[str, float] = {}
+
+        # Reject rows the vectorized encoders would fail on and answer
+        # cached profiles; only the remaining rows are scored
+        pending: Dict[Tuple, List[int]] = {}
+        pending_profiles: List[Dict] = []
+        for i, record in enumerate(records):
+            if not models.feature_encoder.has_gender(record["gender"]):
+                results[i]["error"] = f"Unknown gender: {record['gender']}"
+                continue
+
+            start = time.perf_counter()
+            profile = self._normalize_profile(
+                record["gender"], record["interest"], record["skills"], record["grades"]
             )
+            self._record_stage(timings, "parse", start)
+            key = self._profile_key(profile, models)
+            if key in pending:
+                pending[key].append(i)
+                continue
 
-            # Calculate confidence as inverse of standard deviation
-            # Lower std = higher confidence
-            std_dev = np.std(tree_predictions)
-            confidence = 1.0 / (1.0 + std_dev)
+            cached = self.cache.get(key) if self.cache is not None else None
+            if cached is not None:
+                results[i]["prediction"] = cached
+                continue
 
-            # Get top 3 predictions by analyzing tree predictions
-            unique_predictions, counts = np.unique(
-                np.round(tree_predictions).astype(int), return_counts=True
-            )
+            pending[key] = [i]
+            pending_profiles.append(profile)
 
-            # Sort by count (descending)
-            sorted_indices = np.argsort(counts)[::-1]
-            top_courses = []
-
-            for idx in sorted_indices[:3]:
-                course_code = unique_predictions[idx]
-                probability = counts[idx] / len(tree_predictions)
-
-                # Ensure course code is valid
-                if 0 <= course_code < len(settings.course_mapping):
-                    top_courses.append(
-                        {
-                            "course": settings.course_mapping[course_code],
-                            "probability": float(probability),
-                        }
-                    )
-
-            # Ensure we have at least 3 predictions
-            while len(top_courses) < 3:
-                top_courses.append({"course": "N/A", "probability": 0.0})
-
-            return {
-                "predicted_course": predicted_course,
-                "confidence": float(confidence),
-                "top_predictions": top_courses[:3],
-            }
+        if not pending_profiles:
+            observe_stages(CAREER_STAGE_SECONDS, timings, kind="batch")
+            record_spans(timings, prefix="career")
+            return results
+
+        try:
+            features = self._preprocess_batch(pending_profiles, models, timings)
+            predictions = self._predict_features(features, models, timings)
         except PredictionError:
             raise
         except Exception as e:
-            logger.error(f"Prediction error: {str(e)}")
-            raise PredictionError(f"Prediction failed: {str(e)}")
+            logger.error(f"Batch prediction error: {str(e)}")
+            raise PredictionError(f"Batch prediction failed: {str(e)}")
+        finally:
+            observe_stages(CAREER_STAGE_SECONDS, timings, kind="batch")
+            record_spans(timings, prefix="career")
+
+        for (key, indices), prediction in zip(pending.items(), predictions):
+            if self.cache is not None:
+                self.cache.put(key, prediction)
+            for i in indices:
+                results[i]["prediction"] = prediction
+
+        return results
+
+    def model_versions(self) -> Dict:
+        """
+        Get the serving version, the available versions and the last reload.
+
+        The serving version and reload status are those of this worker
+        process (``worker_pid``); ``active_version`` is the version published
+        to all workers.
+        """
+        self.sync_active_version()
+        return {
+            "worker_pid": os.getpid(),
+            "active_version": self.registry.active_version(),
+            "serving_version": self.version,
+            "versions": self.registry.versions(),
+            "reload": dict(self.reload_state),
+        }
+
+    def cache_stats(self) -> Optional[Dict]:
+        """Get the prediction cache counters, or None if caching is disabled."""
+        return self.cache.stats() if self.cache is not None else None
 
     def is_loaded(self) -> bool:
         """Check if models are loaded successfully."""
-        return self.interest_encoder is not None and self.skills_encoder is not None
+        return self.models is not None
 
     def get_interests(self) -> List[str]:
         """Get list of valid interests."""
@@ -242,7 +684,11 @@ class CareerPredictor:
 
     def get_courses(self) -> List[str]:
         """Get list of valid courses."""
-        return list(settings.course_mapping.values())
+        models = self.models
+        course_mapping = (
+            models.course_mapping if models is not None else settings.course_mapping
+        )
+        return list(course_mapping.values())
 
     def log_feedback(
         self, gender: str, interest: str, skills: str, grades: float, actual_course: str
@@ -0,0 +1,197 @@
+"""Dynamic micro-batching of CLIP image encoding across requests."""
+
+import asyncio
+import concurrent.futures
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+import torch
+
+from app.core.exceptions import PredictionError
+from app.core.logging import get_logger
+from app.core.metrics import CLIP_BATCHER_BATCHES, CLIP_BATCHER_IMAGES
+
+logger = get_logger(__name__)
+
+
+class ImageEncodeBatcher:
+    """Collects image tensors from concurrent requests into one forward pass.
+
+    Callers submit preprocessed image tensors and wait for their embeddings.
+    A background task on the event loop takes the first pending tensor,
+    keeps collecting for up to ``window_ms`` or until ``max_batch_size``
+    tensors are queued, stacks them and runs ``encode_fn`` once over the
+    batch on a dedicated thread and hands each row of the result back to its
+    caller.
+
+    Requests run on model executor threads, so they submit through
+    ``encode_threadsafe``; the forward pass has its own thread so a saturated
+    executor can never starve the batcher.
+    """
+
+    def __init__(
+        self,
+        encode_fn: Callable[[torch.Tensor], torch.Tensor],
+        window_ms: float,
+        max_batch_size: int,
+        max_inference_seconds: float = 10.0,
+    ):
+        """Configure the batcher; call ``start`` from the event loop to run it.
+
+        Args:
+            encode_fn: Maps a (batch, C, H, W) tensor to (batch, dim) embeddings
+            window_ms: How long to wait for more tensors after the first one
+            max_batch_size: Maximum number of tensors per forward pass
+            max_inference_seconds: Longest expected forward pass of a batch
+        """
+        self.encode_fn = encode_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max_batch_size
+        # A tensor may wait for the batch already running, then its own
+        self.timeout = self.window + 2 * max_inference_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._batch: list = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the background batching task is running."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of image tensors waiting for a forward pass."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self) -> None:
+        """Start the batching task on the running event loop."""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._queue = asyncio.Queue()
+        self._pool = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="clip-encoder"
+        )
+        self._task = asyncio.create_task(self._run())
+        logger.info(
+            f"✓ Started CLIP micro-batcher (window {self.window * 1000:.1f} ms, "
+            f"max batch {self.max_batch_size})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the batching task and fail any tensors still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        # Fail the batch that was interrupted and everything still queued
+        pending = self._batch
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("CLIP batcher stopped"))
+        self._batch = []
+
+        self._pool.shutdown(wait=True)
+        self._pool = None
+        logger.info("✓ Stopped CLIP micro-batcher")
+
+    async def encode(self, tensors: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Queue image tensors and wait for their embeddings.
+
+        Args:
+            tensors: Preprocessed (C, H, W) image tensors
+
+        Returns:
+            One embedding per tensor, in order
+        """
+        futures = []
+        for tensor in tensors:
+            future = self._loop.create_future()
+            self._queue.put_nowait((tensor, future))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    def encode_threadsafe(self, tensors: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Blocking version of ``encode`` for worker threads.
+
+        Falls back to encoding directly when the batcher is not running or
+        when called from the event loop thread itself (waiting there would
+        deadlock).
+
+        Raises:
+            PredictionError: If the embeddings do not arrive within
+                ``timeout`` seconds (e.g. the event loop is shutting down)
+        """
+        if not self.running or threading.get_ident() == self._loop_thread:
+            return list(self._encode_batch(tensors))
+        try:
+            future = asyncio.run_coroutine_threadsafe(self.encode(tensors), self._loop)
+        except RuntimeError:
+            # The event loop closed after the running check
+            return list(self._encode_batch(tensors))
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            # Cancels the waiting futures; the batch loop skips them
+            future.cancel()
+            logger.error(f"CLIP batch encoding timed out after {self.timeout:.1f} s")
+            raise PredictionError("CLIP image encoding timed out")
+
+    def _encode_batch(self, tensors: List[torch.Tensor]) -> torch.Tensor:
+        """Stack image tensors and encode them in one forward pass."""
+        return self.encode_fn(torch.stack(tensors))
+
+    async def _collect(self) -> list:
+        """Wait for the first tensor, then gather more until the window closes."""
+        self._batch = batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.window
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Batching loop: collect, encode once, distribute results."""
+        while True:
+            batch = await self._collect()
+            tensors = [tensor for tensor, _ in batch]
+
+            try:
+                # Stacking copies every tensor, so it runs off the event loop
+                embeddings = await self._loop.run_in_executor(
+                    self._pool, self._encode_batch, tensors
+                )
+            except Exception as e:
+                logger.error(f"CLIP batch encoding failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                self._batch = []
+                continue
+
+            CLIP_BATCHER_BATCHES.inc()
+            CLIP_BATCHER_IMAGES.inc(len(batch))
+            for (_, future), embedding in zip(batch, embeddings):
+                # The caller may have given up (e.g. client disconnected)
+                if not future.done():
+                    future.set_result(embedding)
+            self._batch = []
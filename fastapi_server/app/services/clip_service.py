@@ -1,15 +1,33 @@
 """Hybrid image comparison service using CLIP, SSIM, and structural methods."""
+import gc
+import io
+import threading
+import time
 import torch
 import clip
-from PIL import Image
+from PIL import Image, ImageDraw
 import numpy as np
 import cv2
-from typing import Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Tuple, Dict, List, Optional, Set
 from pathlib import Path
-from skimage.metrics import structural_similarity as ssim
 
+from app.config import settings
+from app.core.cache import LRUCache
 from app.core.logging import get_logger
-from app.core.exceptions import ModelNotLoadedError, PredictionError
+from app.core.metrics import CLIP_STAGE_SECONDS, observe_stages
+from app.core.timing import record_spans
+from app.core.exceptions import (
+    InvalidInputError,
+    ModelNotLoadedError,
+    PredictionError,
+    ReferenceNotFoundError,
+)
+from app.services.clip_batcher import ImageEncodeBatcher
+from app.services.clip_visual import load_visual_encoder, visual_only
+from app.services.image_features import FEATURE_FIELDS, ImageFeatures, content_key
+from app.services.reference_store import ReferenceStore
+from app.services.similarity_metrics import METRICS, required_fields
 
 logger = get_logger(__name__)
 
@@ -34,153 +52,754 @@ class CLIPService:
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         self.model = None
         self.preprocess = None
+        self.quantization: Optional[Dict] = None
+        self.batcher: Optional[ImageEncodeBatcher] = None
+        self.feature_cache: Optional[LRUCache] = (
+            LRUCache(
+                max_entries=settings.clip_feature_cache_max_entries,
+                max_bytes=settings.clip_feature_cache_max_mb * 1024 * 1024,
+                sizeof=lambda features: features.nbytes
+            )
+            if settings.clip_feature_cache_enabled
+            else None
+        )
+        self.reference_store = ReferenceStore(
+            settings.clip_reference_dir,
+            max_loaded=settings.clip_reference_cache_max_entries
+        )
+        self._metric_pool: Optional[ThreadPoolExecutor] = None
+        self._metric_pool_lock = threading.Lock()
+        self._configure_threads()
         self._load_model()
         self._initialized = True
     
+    def _configure_threads(self):
+        """Apply the configured torch and OpenCV intra-op thread counts."""
+        if settings.torch_num_threads is not None:
+            torch.set_num_threads(settings.torch_num_threads)
+        if settings.cv2_num_threads is not None:
+            cv2.setNumThreads(settings.cv2_num_threads)
+        logger.info(f"Intra-op threads - torch: {torch.get_num_threads()}, "
+                   f"OpenCV: {cv2.getNumThreads()}")
+    
     def _load_model(self):
         """Load the CLIP model."""
         try:
             logger.info("Loading CLIP model...")
-            self.model, self.preprocess = clip.load("ViT-B/32", device=self.device)
-            logger.info(f"✓ Loaded CLIP model on {self.device}")
+            quantize = settings.clip_quantize_int8 and self.device == "cpu"
+            if settings.clip_visual_weights is not None:
+                self.model, self.preprocess = load_visual_encoder(settings.clip_visual_weights, self.device)
+            elif settings.clip_visual_only or quantize:
+                # Dropping the text tower and quantizing need the eager model
+                model, self.preprocess = clip.load("ViT-B/32", device=self.device, jit=False)
+                if settings.clip_visual_only:
+                    model = visual_only(model)
+                    # Release the text transformer and token embeddings now
+                    gc.collect()
+                self.model = model
+            else:
+                self.model, self.preprocess = clip.load("ViT-B/32", device=self.device)
+            
+            if quantize:
+                self._quantize_visual()
+            
+            n_params = sum(p.numel() for p in self.model.parameters())
+            logger.info(f"✓ Loaded CLIP model on {self.device} ({n_params / 1e6:.1f}M parameters)")
         except Exception as e:
             logger.error(f"Error loading CLIP model: {str(e)}")
             raise ModelNotLoadedError(f"Error loading CLIP model: {str(e)}")
     
-    def _load_image(self, image_path: str) -> Image.Image:
-        """Load an image from path.
+    def _quantize_visual(self):
+        """Apply dynamic int8 quantization to the visual encoder's linear layers.
+        
+        Weights are stored as int8 and activations are quantized on the fly,
+        so only the CPU forward pass changes. Unless disabled, the quantized
+        encoder is first checked against fp32 on sample images and the fp32
+        encoder is kept if the drift is too large.
+        """
+        fp32_visual = self.model.visual
+        int8_visual = torch.ao.quantization.quantize_dynamic(
+            fp32_visual, {torch.nn.Linear}, dtype=torch.qint8
+        )
+        
+        report = {"enabled": True}
+        if settings.clip_quantization_check:
+            report.update(self._quantization_drift(fp32_visual, int8_visual))
+            logger.info(f"Int8 CLIP self-check on {report['samples']} images - "
+                       f"cosine drift mean: {report['mean_drift']:.5f}, max: {report['max_drift']:.5f}")
+            if report["max_drift"] > settings.clip_quantization_max_drift:
+                logger.warning(f"✗ Int8 CLIP drift {report['max_drift']:.5f} exceeds "
+                              f"{settings.clip_quantization_max_drift}; keeping fp32 visual encoder")
+                self.quantization = {**report, "enabled": False}
+                return
+        
+        self.model.visual = int8_visual
+        self.quantization = report
+        logger.info("✓ Quantized CLIP visual encoder linear layers to int8")
+    
+    def _sample_images(self) -> List[Image.Image]:
+        """Synthetic images for the quantization self-check."""
+        size = (224, 224)
+        outline = Image.new("L", size, 255)
+        ImageDraw.Draw(outline).ellipse((40, 40, 184, 184), outline=0, width=4)
+        images = [
+            Image.linear_gradient("L").resize(size),
+            Image.radial_gradient("L").resize(size),
+            Image.effect_mandelbrot(size, (-2.0, -1.5, 1.0, 1.5), 100),
+            Image.effect_noise(size, 64),
+            outline,
+        ]
+        return [image.convert("RGB") for image in images]
+    
+    def _quantization_drift(self, fp32_visual: torch.nn.Module, int8_visual: torch.nn.Module) -> Dict:
+        """Compare int8 and fp32 embeddings of the sample images.
+        
+        Returns:
+            Dictionary with the number of "samples" and the "mean_drift" and
+            "max_drift" of 1 - cosine similarity
+        """
+        images = torch.stack([self.preprocess(image) for image in self._sample_images()])
+        images = images.to(self.device).type(self.model.dtype)
+        
+        with torch.inference_mode():
+            reference = fp32_visual(images).float()
+            quantized = int8_visual(images).float()
+        
+        reference = reference / reference.norm(dim=-1, keepdim=True)
+        quantized = quantized / quantized.norm(dim=-1, keepdim=True)
+        drift = 1.0 - (reference * quantized).sum(dim=-1)
+        return {
+            "samples": len(images),
+            "mean_drift": float(drift.mean()),
+            "max_drift": float(drift.max()),
+        }
+    
+    def _load_image(self, data: bytes) -> Image.Image:
+        """Decode an image from its encoded bytes, downscaled while decoding.
+        
+        Everything downstream works at 224x224, so images are reduced to at
+        most settings.clip_max_decode_side on their longest side. JPEGs use
+        draft mode, which makes the decoder scale by 1/2, 1/4 or 1/8 during
+        the DCT so the full-resolution image is never materialized; other
+        formats are reduced right after decoding.
         
         Args:
-            image_path: Path to the image file
+            data: Encoded image (JPEG, PNG, ...) bytes
             
         Returns:
             PIL Image object
         """
         try:
-            return Image.open(image_path).convert("RGB")
+            image = Image.open(io.BytesIO(data))
+            max_side = settings.clip_max_decode_side
+            
+            if max_side:
+                # No-op for non-JPEG formats
+                image.draft("RGB", (max_side, max_side))
+            
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            
+            if max_side and max(image.size) > max_side:
+                image.thumbnail((max_side, max_side), reducing_gap=2.0)
+            
+            return image
         except Exception as e:
-            raise PredictionError(f"Error loading image {image_path}: {str(e)}")
+            raise PredictionError(f"Error loading image: {str(e)}")
     
-    def _compute_clip_similarity(self, image1: Image.Image, image2: Image.Image) -> float:
-        """Compute CLIP semantic similarity."""
-        image1_preprocessed = self.preprocess(image1).unsqueeze(0).to(self.device)
-        image2_preprocessed = self.preprocess(image2).unsqueeze(0).to(self.device)
+    def _encode_images(self, images: torch.Tensor) -> torch.Tensor:
+        """Encode a batch of preprocessed images into normalized CLIP embeddings.
         
-        with torch.no_grad():
-            image1_features = self.model.encode_image(image1_preprocessed)
-            image2_features = self.model.encode_image(image2_preprocessed)
+        Args:
+            images: Tensor of shape (batch, 3, H, W)
             
-            # Normalize features
-            image1_features = image1_features / image1_features.norm(dim=-1, keepdim=True)
-            image2_features = image2_features / image2_features.norm(dim=-1, keepdim=True)
+        Returns:
+            Tensor of shape (batch, embed_dim) with unit-norm rows
+        """
+        with torch.inference_mode():
+            features = self.model.encode_image(images.to(self.device))
+            return features / features.norm(dim=-1, keepdim=True)
+    
+    def _embed_images(self, images: List[Image.Image], timings: Dict[str, float]) -> List[np.ndarray]:
+        """Compute normalized CLIP embeddings for PIL images in one forward pass.
+        
+        Args:
+            images: Decoded RGB images
+            timings: Dictionary accumulating the "preprocess" (resize, crop,
+                normalize) and "encode_image" (forward pass) wall times in ms
             
-            # Compute cosine similarity
-            similarity = (image1_features @ image2_features.T).item()
+        Returns:
+            One float32 embedding per image
+        """
+        preprocessed, elapsed = self._timed(lambda: [self.preprocess(image) for image in images])
+        self._add_time(timings, "preprocess", elapsed)
         
-        return max(0.0, min(1.0, similarity))
-    
-    def _compute_structural_similarity(self, image1: Image.Image, image2: Image.Image) -> float:
-        """Compute SSIM (Structural Similarity Index) for pixel-level comparison."""
-        # Convert to grayscale numpy arrays
-        img1_gray = cv2.cvtColor(np.array(image1), cv2.COLOR_RGB2GRAY)
-        img2_gray = cv2.cvtColor(np.array(image2), cv2.COLOR_RGB2GRAY)
+        start = time.perf_counter()
+        if self.batcher is not None and self.batcher.running:
+            # Share the forward pass with concurrent requests
+            features = self.batcher.encode_threadsafe(preprocessed)
+        else:
+            # All images in a single forward pass
+            features = self._encode_images(torch.stack(preprocessed))
         
-        # Resize to same dimensions
+        embeddings = [f.float().cpu().numpy() for f in features]
+        self._add_time(timings, "encode_image", (time.perf_counter() - start) * 1000)
+        return embeddings
+    
+    def _grayscale(self, rgb: np.ndarray) -> np.ndarray:
+        """Convert to grayscale and resize to the 224x224 comparison size."""
+        img_gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
         target_size = (224, 224)
-        img1_resized = cv2.resize(img1_gray, target_size)
-        img2_resized = cv2.resize(img2_gray, target_size)
+        return cv2.resize(img_gray, target_size)
+    
+    def _histogram(self, rgb: np.ndarray) -> np.ndarray:
+        """Compute the normalized 8x8x8 color histogram."""
+        # Channels listed as B, G, R so the bins match a histogram of the BGR
+        # image without converting it
+        hist = cv2.calcHist([rgb], [2, 1, 0], None, [8, 8, 8], [0, 256, 0, 256, 0, 256])
+        return cv2.normalize(hist, hist).flatten()
+    
+    def _extract_features(self, features: ImageFeatures, rgb: np.ndarray, fields: Set[str]) -> ImageFeatures:
+        """Run the single per-image preprocessing pass.
+        
+        The grayscale, edge map and histogram are all derived from one RGB
+        array. Only the requested fields that are still missing are computed.
         
-        # Compute SSIM
-        score, _ = ssim(img1_resized, img2_resized, full=True)
-        return max(0.0, min(1.0, score))
+        Args:
+            features: Bundle to complete (new, cached or from an earlier
+                cascade stage)
+            rgb: Decoded RGB pixels of the image
+            fields: ImageFeatures fields to compute (the embedding is ignored)
+            
+        Returns:
+            The completed bundle
+        """
+        if ("gray" in fields or "edges" in fields) and features.gray is None:
+            features.gray = self._grayscale(rgb)
+        if "edges" in fields and features.edges is None:
+            features.edges = cv2.Canny(features.gray, 50, 150)
+        if "histogram" in fields and features.histogram is None:
+            features.histogram = self._histogram(rgb)
+        return features
+    
+    def _get_metric_pool(self) -> Optional[ThreadPoolExecutor]:
+        """Get the shared metric thread pool, or None if metrics run serially."""
+        if not settings.clip_parallel_metrics:
+            return None
+        with self._metric_pool_lock:
+            if self._metric_pool is None:
+                self._metric_pool = ThreadPoolExecutor(
+                    max_workers=settings.clip_metric_workers,
+                    thread_name_prefix="clip-metric"
+                )
+            return self._metric_pool
+    
+    @staticmethod
+    def _timed(func: Callable, *args) -> Tuple[Any, float]:
+        """Call func and return its result with the wall time in milliseconds."""
+        start = time.perf_counter()
+        result = func(*args)
+        return result, (time.perf_counter() - start) * 1000
+    
+    @staticmethod
+    def _add_time(timings: Dict[str, float], stage: str, elapsed: float):
+        """Accumulate a stage wall time (stages can run once per cascade step)."""
+        timings[stage] = timings.get(stage, 0.0) + elapsed
     
-    def _compute_histogram_similarity(self, image1: Image.Image, image2: Image.Image) -> float:
-        """Compute color histogram correlation."""
-        img1_cv = cv2.cvtColor(np.array(image1), cv2.COLOR_RGB2BGR)
-        img2_cv = cv2.cvtColor(np.array(image2), cv2.COLOR_RGB2BGR)
+    def _get_features(
+        self,
+        images: List[bytes],
+        fields: Set[str],
+        timings: Optional[Dict[str, float]] = None,
+        previous: Optional[List[ImageFeatures]] = None
+    ) -> List[ImageFeatures]:
+        """Get feature bundles for images, reusing cached ones by content hash.
         
-        # Compute histograms
-        hist1 = cv2.calcHist([img1_cv], [0, 1, 2], None, [8, 8, 8], [0, 256, 0, 256, 0, 256])
-        hist2 = cv2.calcHist([img2_cv], [0, 1, 2], None, [8, 8, 8], [0, 256, 0, 256, 0, 256])
+        Only images whose bundle is not cached (or lacks a needed field) are
+        decoded, unless the bundle still carries its RGB pixels; missing
+        embeddings are computed together. With parallel metrics enabled, the
+        images decode concurrently and the CLIP forward pass runs on the
+        metric pool while this thread extracts the SSIM/edge/histogram inputs.
         
-        # Normalize
-        hist1 = cv2.normalize(hist1, hist1).flatten()
-        hist2 = cv2.normalize(hist2, hist2).flatten()
+        Args:
+            images: Encoded images
+            fields: ImageFeatures fields needed by the metrics
+            timings: Optional dictionary accumulating the "decode", "extract",
+                "preprocess" and "encode_image" wall times in milliseconds
+            previous: Bundles returned by an earlier call for the same images
+                (a cascade stage), completed instead of looked up again
+            
+        Returns:
+            One ImageFeatures per image, in order
+        """
+        timings = timings if timings is not None else {}
+        keys = [content_key(data) for data in images]
+        
+        bundles: Dict[str, Optional[ImageFeatures]] = {}
+        sources: Dict[str, bytes] = {}
+        for i, (key, data) in enumerate(zip(keys, images)):
+            if key not in bundles:
+                if previous is not None:
+                    bundles[key] = previous[i]
+                elif self.feature_cache is not None:
+                    bundles[key] = self.feature_cache.get(key)
+                else:
+                    bundles[key] = None
+                sources[key] = data
+        
+        missing = [
+            key for key, bundle in bundles.items()
+            if bundle is None or not bundle.has(fields)
+        ]
+        
+        # Bundles from an earlier stage keep their pixels; decode the rest.
+        # Images decode concurrently on the metric pool (PIL releases the GIL)
+        to_decode = [key for key in missing if bundles[key] is None or bundles[key].rgb is None]
+        pool = self._get_metric_pool()
+        load = pool.map if pool is not None and len(to_decode) > 1 else map
+        decoded, elapsed = self._timed(
+            lambda: dict(zip(to_decode, load(self._load_image, [sources[key] for key in to_decode])))
+        )
+        self._add_time(timings, "decode", elapsed)
+        
+        rgb = {key: bundles[key].rgb for key in missing if key not in decoded}
+        for key, image in decoded.items():
+            # PIL exports the pixels into a new (read-only) array; it is made
+            # once per image and every extracted feature reads from it
+            rgb[key] = np.asarray(image)
+            if bundles[key] is None:
+                bundles[key] = ImageFeatures(rgb=rgb[key])
+        
+        extract_fields = fields - {"embedding"}
+        to_extract = [key for key in missing if not bundles[key].has(extract_fields)]
+        to_embed = [key for key in missing if "embedding" in fields and bundles[key].embedding is None]
+        embed_images = [
+            decoded[key] if key in decoded else Image.fromarray(rgb[key]) for key in to_embed
+        ]
+        
+        # Start the CLIP forward pass first so it overlaps with extraction
+        embed_future = None
+        if to_embed and pool is not None:
+            embed_future = pool.submit(self._embed_images, embed_images, timings)
         
-        # Compute correlation
-        correlation = cv2.compareHist(hist1, hist2, cv2.HISTCMP_CORREL)
-        return max(0.0, min(1.0, correlation))
+        _, elapsed = self._timed(
+            lambda: [self._extract_features(bundles[key], rgb[key], extract_fields) for key in to_extract]
+        )
+        self._add_time(timings, "extract", elapsed)
+        
+        if to_embed:
+            if embed_future is not None:
+                embeddings = embed_future.result()
+            else:
+                embeddings = self._embed_images(embed_images, timings)
+            for key, embedding in zip(to_embed, embeddings):
+                bundles[key].embedding = embedding
+        
+        if self.feature_cache is not None:
+            for key in missing:
+                # The full-size RGB array is only needed while extracting
+                self.feature_cache.put(key, bundles[key].without_rgb())
+        
+        return [bundles[key] for key in keys]
     
-    def _compute_edge_similarity(self, image1: Image.Image, image2: Image.Image) -> float:
-        """Compute edge-based similarity for outline comparison."""
-        # Convert to grayscale
-        img1_gray = cv2.cvtColor(np.array(image1), cv2.COLOR_RGB2GRAY)
-        img2_gray = cv2.cvtColor(np.array(image2), cv2.COLOR_RGB2GRAY)
+    def _resolve_profile(self, profile: Optional[str]) -> Tuple[str, Dict[str, float]]:
+        """Look up the weights of a scoring profile.
         
-        # Resize to same dimensions
-        target_size = (224, 224)
-        img1_resized = cv2.resize(img1_gray, target_size)
-        img2_resized = cv2.resize(img2_gray, target_size)
+        Args:
+            profile: Profile name, or None for settings.clip_default_profile
+            
+        Returns:
+            Tuple of (profile name, metric -> weight) without zero weights
+        """
+        name = profile or settings.clip_default_profile
+        weights = settings.clip_scoring_profiles.get(name)
+        if weights is None:
+            available = ", ".join(sorted(settings.clip_scoring_profiles))
+            raise InvalidInputError(f"Unknown scoring profile '{name}' (available: {available})")
+        
+        unknown = sorted(set(weights) - set(METRICS))
+        if unknown:
+            raise PredictionError(f"Scoring profile '{name}' uses unknown metrics: {', '.join(unknown)}")
+        
+        weights = {metric: weight for metric, weight in weights.items() if weight > 0}
+        if not weights:
+            raise PredictionError(f"Scoring profile '{name}' has no positive weights")
+        return name, weights
+    
+    def _compute_metrics(
+        self,
+        features1: ImageFeatures,
+        features2: ImageFeatures,
+        metric_names: List[str],
+        timings: Dict[str, float]
+    ) -> Dict[str, float]:
+        """Compute the individual metric scores, concurrently if enabled.
+        
+        The OpenCV, scikit-image and NumPy kernels release the GIL, so the
+        metrics overlap on the metric pool.
+        
+        Args:
+            features1: Bundle of the first image
+            features2: Bundle of the second image
+            metric_names: Registered metrics to compute
+            timings: Dictionary receiving each metric's wall time in ms
+            
+        Returns:
+            Dictionary mapping metric name to score
+        """
+        metrics = {name: METRICS[name].compute for name in metric_names}
+        
+        pool = self._get_metric_pool()
+        if pool is not None and len(metrics) > 1:
+            futures = {
+                name: pool.submit(self._timed, metric, features1, features2)
+                for name, metric in metrics.items()
+            }
+            results = {name: future.result() for name, future in futures.items()}
+        else:
+            results = {
+                name: self._timed(metric, features1, features2)
+                for name, metric in metrics.items()
+            }
+        
+        scores = {}
+        for name, (score, elapsed) in results.items():
+            scores[name] = float(score)
+            timings[name] = elapsed
+        return scores
+    
+    def _cascade_stages(self, weights: Dict[str, float]) -> List[List[str]]:
+        """Split a profile's metrics into the configured cascade stages.
+        
+        Metrics not listed in settings.clip_cascade_stages run in a final
+        stage of their own; empty stages are dropped.
+        """
+        stages = [
+            [name for name in stage if name in weights]
+            for stage in settings.clip_cascade_stages
+        ]
+        staged = {name for stage in stages for name in stage}
+        stages.append([name for name in weights if name not in staged])
+        return [stage for stage in stages if stage]
+    
+    def _score(
+        self,
+        images: List[bytes],
+        reference: Optional[ImageFeatures],
+        profile: str,
+        weights: Dict[str, float],
+        cascade: bool
+    ) -> Dict:
+        """Compute the weighted hybrid score, optionally as an early-exit cascade.
+        
+        Without the cascade all of the profile's metrics run in one stage.
+        With it, the stages run cheapest first. After each stage the final
+        score is known to lie in [S_p, S_p + W_r], where S_p is the weighted
+        score so far and W_r the weight still to compute. Once that interval
+        is entirely above clip_cascade_accept_threshold or entirely below
+        clip_cascade_reject_threshold, the rest is skipped and the partial
+        score is returned renormalized, S_p / (1 - W_r).
+        
+        Args:
+            images: Encoded images to compare (one if reference is given)
+            reference: Precomputed features of the first image, if any
+            profile: Name of the scoring profile
+            weights: Positive metric weights of the profile
+            cascade: Whether to stop as soon as the outcome is decided
+            
+        Returns:
+            Dictionary with "similarity", "profile", "scores", "stages",
+            "early_exit" and "timings_ms"
+        """
+        # Weights are relative, so the combined score stays within 0-1
+        total_weight = sum(weights.values())
+        normalized = {name: weight / total_weight for name, weight in weights.items()}
+        stages = self._cascade_stages(weights) if cascade else [list(weights)]
+        
+        timings: Dict[str, float] = {}
+        scores: Dict[str, float] = {}
+        stages_run: List[List[str]] = []
+        bundles: Optional[List[ImageFeatures]] = None
+        partial = 0.0
+        early_exit = False
         
-        # Apply Canny edge detection
-        edges1 = cv2.Canny(img1_resized, 50, 150)
-        edges2 = cv2.Canny(img2_resized, 50, 150)
+        for i, stage in enumerate(stages):
+            # Load (or reuse) only the features this stage's metrics need
+            bundles = self._get_features(images, required_fields(stage), timings, previous=bundles)
+            features1, features2 = (reference, bundles[0]) if reference is not None else bundles
+            
+            scores.update(self._compute_metrics(features1, features2, stage, timings))
+            stages_run.append(stage)
+            partial += sum(normalized[name] * scores[name] for name in stage)
+            
+            remaining = sum(normalized[name] for later in stages[i + 1:] for name in later)
+            if remaining > 0 and (
+                partial >= settings.clip_cascade_accept_threshold
+                or partial + remaining <= settings.clip_cascade_reject_threshold
+            ):
+                early_exit = True
+                partial /= 1.0 - remaining
+                break
+        
+        similarity = max(0.0, min(1.0, partial))
         
-        # Compute SSIM on edges
-        score, _ = ssim(edges1, edges2, full=True)
-        return max(0.0, min(1.0, score))
+        breakdown = ", ".join(f"{name}: {score:.3f}" for name, score in scores.items())
+        exit_note = f", early exit after {len(stages_run)}/{len(stages)} stages" if early_exit else ""
+        logger.info(f"Similarity breakdown ({profile}) - {breakdown}, Final: {similarity:.3f}{exit_note}")
+        observe_stages(CLIP_STAGE_SECONDS, timings)
+        record_spans(timings, prefix="clip")
+        
+        return {
+            "similarity": float(similarity),
+            "profile": profile,
+            "scores": scores,
+            "stages": stages_run,
+            "early_exit": early_exit,
+            "timings_ms": timings,
+        }
     
-    def compute_similarity(self, image1_path: str, image2_path: str) -> float:
+    def compute_similarity(
+        self,
+        image1_path: str,
+        image2_path: str,
+        profile: Optional[str] = None,
+        cascade: Optional[bool] = None
+    ) -> float:
+        """
+        Compute hybrid similarity between two image files.
+        
+        Reads the files and delegates to compute_similarity_from_bytes.
+        
+        Args:
+            image1_path: Path to first image (reference/outline)
+            image2_path: Path to second image (drawn image)
+            profile: Scoring profile name (default settings.clip_default_profile)
+            cascade: Stop once the outcome is decided (default
+                settings.clip_cascade_enabled)
+            
+        Returns:
+            Weighted similarity score (0-1, higher is more similar)
+        """
+        try:
+            image1 = Path(image1_path).read_bytes()
+            image2 = Path(image2_path).read_bytes()
+        except OSError as e:
+            raise PredictionError(f"Error loading image: {str(e)}")
+        return self.compute_similarity_from_bytes(image1, image2, profile, cascade)
+    
+    def compute_similarity_from_bytes(
+        self,
+        image1: bytes,
+        image2: bytes,
+        profile: Optional[str] = None,
+        cascade: Optional[bool] = None
+    ) -> float:
         """
         Compute hybrid similarity optimized for outline/drawing comparison.
         
-        Combines:
+        See compute_similarity_detailed.
+        
+        Args:
+            image1: Encoded first image (reference/outline)
+            image2: Encoded second image (drawn image)
+            profile: Scoring profile name (default settings.clip_default_profile)
+            cascade: Stop once the outcome is decided (default
+                settings.clip_cascade_enabled)
+            
+        Returns:
+            Weighted similarity score (0-1, higher is more similar)
+        """
+        return self.compute_similarity_detailed(image1, image2, profile, cascade)["similarity"]
+    
+    def compute_similarity_detailed(
+        self,
+        image1: bytes,
+        image2: bytes,
+        profile: Optional[str] = None,
+        cascade: Optional[bool] = None
+    ) -> Dict:
+        """
+        Compute hybrid similarity with per-metric scores and wall times.
+        
+        Combines the metrics of a scoring profile from
+        settings.clip_scoring_profiles. The default "hybrid" profile weighs:
         - CLIP semantic similarity (30%)
         - Structural similarity/SSIM (30%)
         - Edge similarity (30%)
         - Histogram similarity (10%)
         
+        Metrics outside the profile, and the features only they need, are
+        never computed; "fast" skips the CLIP forward pass entirely. In
+        cascade mode the cheap metrics run first and the comparison stops
+        as soon as the score is clearly above or below the cascade
+        thresholds, usually before the CLIP forward pass.
+        Per-image features are cached by content hash, so a repeated image
+        (e.g. a reference outline) is not decoded or encoded again. Images
+        are decoded straight from the buffers, without touching the disk.
+        
         Args:
-            image1_path: Path to first image (reference/outline)
-            image2_path: Path to second image (drawn image)
+            image1: Encoded first image (reference/outline)
+            image2: Encoded second image (drawn image)
+            profile: Scoring profile name (default settings.clip_default_profile)
+            cascade: Stop once the outcome is decided (default
+                settings.clip_cascade_enabled)
             
         Returns:
-            Weighted similarity score (0-1, higher is more similar)
+            Dictionary with the weighted "similarity" (0-1, higher is more
+            similar), the "profile" used, the per-metric "scores", the
+            metric "stages" that ran, whether the cascade exited "early_exit"
+            and "timings_ms" (decode, extract, preprocess, encode_image and
+            each metric, in ms)
         """
         if not self.is_loaded():
             raise ModelNotLoadedError("CLIP model not loaded")
         
+        profile, weights = self._resolve_profile(profile)
+        if cascade is None:
+            cascade = settings.clip_cascade_enabled
+        
         try:
-            # Load images
-            image1 = self._load_image(image1_path)
-            image2 = self._load_image(image2_path)
-            
-            # Compute different similarity metrics
-            clip_sim = self._compute_clip_similarity(image1, image2)
-            structural_sim = self._compute_structural_similarity(image1, image2)
-            edge_sim = self._compute_edge_similarity(image1, image2)
-            hist_sim = self._compute_histogram_similarity(image1, image2)
-            
-            # Weighted combination (optimized for outline/drawing comparison)
-            # Higher weight on structural and edge similarity for shape matching
-            similarity = (
-                0.30 * clip_sim +          # Semantic understanding
-                0.30 * structural_sim +     # Pixel-level structure
-                0.30 * edge_sim +           # Shape/outline matching
-                0.10 * hist_sim             # Color similarity
-            )
+            return self._score([image1, image2], None, profile, weights, cascade)
             
-            logger.info(f"Similarity breakdown - CLIP: {clip_sim:.3f}, SSIM: {structural_sim:.3f}, "
-                       f"Edge: {edge_sim:.3f}, Hist: {hist_sim:.3f}, Final: {similarity:.3f}")
+        except PredictionError:
+            raise
+        except Exception as e:
+            logger.error(f"Error computing similarity: {str(e)}")
+            raise PredictionError(f"Failed to compute image similarity: {str(e)}")
+    
+    def register_reference(self, image: bytes, filename: Optional[str] = None) -> Dict:
+        """
+        Precompute and persist the features of a reference image.
+        
+        The reference id is the content hash of the image, so registering the
+        same image twice returns the existing reference.
+        
+        Args:
+            image: Encoded reference image
+            filename: Original file name, stored as metadata
             
-            return float(similarity)
+        Returns:
+            Stored reference metadata, including "reference_id"
+        """
+        if not self.is_loaded():
+            raise ModelNotLoadedError("CLIP model not loaded")
+        
+        try:
+            reference_id = content_key(image)
+            if self.reference_store.exists(reference_id):
+                return self.reference_store.metadata(reference_id)
+            
+            # The embedding is always stored so any weighting can use it
+            features = self._get_features([image], set(FEATURE_FIELDS))[0]
+            return self.reference_store.save(
+                reference_id,
+                features,
+                {"filename": filename, "clip_model": "ViT-B/32"}
+            )
+        except PredictionError:
+            raise
+        except Exception as e:
+            logger.error(f"Error registering reference image: {str(e)}")
+            raise PredictionError(f"Failed to register reference image: {str(e)}")
+    
+    def compute_similarity_to_reference(
+        self,
+        reference_id: str,
+        image: bytes,
+        profile: Optional[str] = None,
+        cascade: Optional[bool] = None
+    ) -> float:
+        """
+        Compute hybrid similarity between a registered reference and an image.
+        
+        See compute_similarity_to_reference_detailed.
+        
+        Args:
+            reference_id: Id returned by register_reference
+            image: Encoded drawn image
+            profile: Scoring profile name (default settings.clip_default_profile)
+            cascade: Stop once the outcome is decided (default
+                settings.clip_cascade_enabled)
+            
+        Returns:
+            Weighted similarity score (0-1, higher is more similar)
+        """
+        return self.compute_similarity_to_reference_detailed(reference_id, image, profile, cascade)["similarity"]
+    
+    def compute_similarity_to_reference_detailed(
+        self,
+        reference_id: str,
+        image: bytes,
+        profile: Optional[str] = None,
+        cascade: Optional[bool] = None
+    ) -> Dict:
+        """
+        Compute hybrid similarity between a registered reference and an image,
+        with per-metric scores and wall times.
+        
+        Only the drawn image is decoded and encoded; the reference features
+        come from the reference store.
+        
+        Args:
+            reference_id: Id returned by register_reference
+            image: Encoded drawn image
+            profile: Scoring profile name (default settings.clip_default_profile)
+            cascade: Stop once the outcome is decided (default
+                settings.clip_cascade_enabled)
             
+        Returns:
+            Dictionary as returned by compute_similarity_detailed
+        """
+        if not self.is_loaded():
+            raise ModelNotLoadedError("CLIP model not loaded")
+        
+        if not self.reference_store.is_valid_id(reference_id):
+            raise ReferenceNotFoundError(f"Reference image not found: {reference_id}")
+        reference = self.reference_store.load(reference_id)
+        if reference is None:
+            raise ReferenceNotFoundError(f"Reference image not found: {reference_id}")
+        
+        profile, weights = self._resolve_profile(profile)
+        if cascade is None:
+            cascade = settings.clip_cascade_enabled
+        
+        try:
+            return self._score([image], reference, profile, weights, cascade)
         except PredictionError:
             raise
         except Exception as e:
             logger.error(f"Error computing similarity: {str(e)}")
             raise PredictionError(f"Failed to compute image similarity: {str(e)}")
     
+    def feature_cache_stats(self) -> Optional[Dict]:
+        """Get the image feature cache counters, or None if caching is disabled."""
+        return self.feature_cache.stats() if self.feature_cache is not None else None
+    
+    async def start_batcher(self):
+        """Start micro-batching image encoding across concurrent requests."""
+        if not self.is_loaded():
+            return
+        if self.batcher is None:
+            self.batcher = ImageEncodeBatcher(
+                self._encode_images,
+                window_ms=settings.clip_batch_window_ms,
+                max_batch_size=settings.clip_batch_max_size,
+                max_inference_seconds=settings.clip_batch_max_inference_seconds
+            )
+        await self.batcher.start()
+    
+    async def stop_batcher(self):
+        """Stop the micro-batcher; encoding falls back to per-request passes."""
+        if self.batcher is not None:
+            await self.batcher.stop()
+    
+    def shutdown(self):
+        """Stop the metric pool threads after the running metrics finish."""
+        with self._metric_pool_lock:
+            if self._metric_pool is not None:
+                self._metric_pool.shutdown(wait=True)
+                self._metric_pool = None
+    
     def is_loaded(self) -> bool:
         """Check if CLIP model is loaded successfully."""
         return self.model is not None and self.preprocess is not None
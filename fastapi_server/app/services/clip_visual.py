@@ -0,0 +1,125 @@
+"""Visual-only CLIP encoder that does not keep the text tower in memory."""
+
+from pathlib import Path
+from typing import Callable, Dict, Tuple, Union
+
+import torch
+from clip import model as clip_model
+from PIL import Image
+from torch import nn
+from torchvision.transforms import CenterCrop, Compose, Normalize, Resize, ToTensor
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CLIPVisualEncoder(nn.Module):
+    """The parts of a CLIP model that ``CLIPService`` uses.
+
+    Wraps the visual transformer (including its output projection) and
+    exposes the same ``visual``, ``dtype`` and ``encode_image`` as
+    ``clip.model.CLIP``, so it can stand in for the full model.
+    """
+
+    def __init__(self, visual: nn.Module):
+        super().__init__()
+        self.visual = visual
+
+    @property
+    def dtype(self) -> torch.dtype:
+        return self.visual.conv1.weight.dtype
+
+    def encode_image(self, image: torch.Tensor) -> torch.Tensor:
+        return self.visual(image.type(self.dtype))
+
+
+def _visual_transformer_class() -> type:
+    """Get the ViT class; its name differs between CLIP distributions."""
+    # VisionTransformer in openai/CLIP, VisualTransformer in clip-by-openai
+    cls = getattr(clip_model, "VisionTransformer", None)
+    return cls if cls is not None else getattr(clip_model, "VisualTransformer")
+
+
+def build_visual(state_dict: Dict[str, torch.Tensor]) -> nn.Module:
+    """Build a CLIP visual transformer from its state dict.
+
+    The architecture is inferred from the tensor shapes, as
+    ``clip.model.build_model`` does for full checkpoints.
+
+    Args:
+        state_dict: State dict of ``CLIP.visual`` (keys without "visual.")
+
+    Returns:
+        Visual transformer with the weights loaded (float32)
+    """
+    width = state_dict["conv1.weight"].shape[0]
+    patch_size = state_dict["conv1.weight"].shape[-1]
+    grid_size = round((state_dict["positional_embedding"].shape[0] - 1) ** 0.5)
+    layers = len(
+        {
+            key.split(".")[2]
+            for key in state_dict
+            if key.startswith("transformer.resblocks.")
+            and key.endswith(".attn.in_proj_weight")
+        }
+    )
+
+    visual = _visual_transformer_class()(
+        input_resolution=patch_size * grid_size,
+        patch_size=patch_size,
+        width=width,
+        layers=layers,
+        heads=width // 64,
+        output_dim=state_dict["proj"].shape[1],
+    )
+    visual.load_state_dict({key: value.float() for key, value in state_dict.items()})
+    return visual
+
+
+def visual_transform(n_px: int) -> Callable[[Image.Image], torch.Tensor]:
+    """CLIP's image preprocessing for an input resolution of ``n_px``."""
+    return Compose(
+        [
+            Resize(n_px, interpolation=Image.BICUBIC),
+            CenterCrop(n_px),
+            lambda image: image.convert("RGB"),
+            ToTensor(),
+            Normalize(
+                (0.48145466, 0.4578275, 0.40821073),
+                (0.26862954, 0.26130258, 0.27577711),
+            ),
+        ]
+    )
+
+
+def visual_only(model: nn.Module) -> CLIPVisualEncoder:
+    """Keep only the visual tower of a loaded (non-JIT) CLIP model.
+
+    The caller must drop its own reference to ``model`` for the text
+    transformer and token embeddings to be freed.
+    """
+    return CLIPVisualEncoder(model.visual).eval()
+
+
+def load_visual_encoder(
+    path: Union[str, Path], device: str
+) -> Tuple[CLIPVisualEncoder, Callable[[Image.Image], torch.Tensor]]:
+    """Load a visual-only state dict written by ``export_clip_visual.py``.
+
+    Args:
+        path: File holding the state dict of ``CLIP.visual``
+        device: Device to load the encoder on
+
+    Returns:
+        Tuple of (encoder, preprocess), like ``clip.load``
+    """
+    state_dict = torch.load(path, map_location="cpu", weights_only=True)
+    visual = build_visual(state_dict)
+    if device != "cpu":
+        # Same mixed precision as clip.load on GPU
+        clip_model.convert_weights(visual)
+    encoder = CLIPVisualEncoder(visual).to(device).eval()
+
+    logger.info(f"✓ Loaded CLIP visual encoder from {path}")
+    return encoder, visual_transform(visual.input_resolution)
@@ -0,0 +1,207 @@
+"""Precomputed feature encoding for career predictions."""
+
+import threading
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class FeatureEncoder:
+    """Encodes career inputs straight into scaled feature rows.
+
+    Built once from the fitted encoders' ``classes_`` and the scaler's
+    ``mean_``/``scale_``, so the request path does dictionary lookups and a
+    scatter into a buffer instead of calling ``LabelEncoder.transform``,
+    ``MultiLabelBinarizer.transform`` and ``StandardScaler.transform`` (each
+    with its own input validation). The arithmetic is the same as sklearn's,
+    so the scaled rows are identical.
+
+    Feature order: gender, grades, interest features, skill features.
+    """
+
+    def __init__(
+        self,
+        gender_classes: Sequence[str],
+        interest_classes: Sequence[str],
+        skill_classes: Sequence[str],
+        mean: np.ndarray,
+        scale: np.ndarray,
+    ):
+        """Build the token -> column lookup tables.
+
+        Args:
+            gender_classes: Gender labels in encoded order
+            interest_classes: Interest vocabulary in column order
+            skill_classes: Skill vocabulary in column order
+            mean: Per-feature mean subtracted before scaling
+            scale: Per-feature scale divided by after centering
+        """
+        self.gender_classes = [str(gender) for gender in gender_classes]
+        self.interest_classes = [str(token) for token in interest_classes]
+        self.skill_classes = [str(token) for token in skill_classes]
+
+        self.gender_codes: Dict[str, int] = {
+            str(gender): code for code, gender in enumerate(gender_classes)
+        }
+        interest_offset = 2
+        skill_offset = interest_offset + len(interest_classes)
+        self.interest_columns: Dict[str, int] = {
+            str(token): interest_offset + i for i, token in enumerate(interest_classes)
+        }
+        self.skill_columns: Dict[str, int] = {
+            str(token): skill_offset + i for i, token in enumerate(skill_classes)
+        }
+        self.n_features = skill_offset + len(skill_classes)
+
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        if self.mean.shape != (self.n_features,) or self.scale.shape != (
+            self.n_features,
+        ):
+            raise ValueError(
+                f"Scaler has {self.mean.shape[0]} features, encoders produce "
+                f"{self.n_features}"
+            )
+
+        self._local = threading.local()
+
+    @classmethod
+    def from_sklearn(
+        cls, gender_encoder, interest_encoder, skills_encoder, scaler
+    ) -> "FeatureEncoder":
+        """Build the encoder from fitted sklearn preprocessing objects.
+
+        Args:
+            gender_encoder: Fitted LabelEncoder for gender
+            interest_encoder: Fitted MultiLabelBinarizer for interests
+            skills_encoder: Fitted MultiLabelBinarizer for skills
+            scaler: Fitted StandardScaler
+
+        Returns:
+            FeatureEncoder equivalent to the sklearn pipeline
+        """
+        n_features = 2 + len(interest_encoder.classes_) + len(skills_encoder.classes_)
+        mean = (
+            scaler.mean_ if getattr(scaler, "with_mean", True) else np.zeros(n_features)
+        )
+        scale = (
+            scaler.scale_ if getattr(scaler, "with_std", True) else np.ones(n_features)
+        )
+        encoder = cls(
+            gender_classes=list(gender_encoder.classes_),
+            interest_classes=list(interest_encoder.classes_),
+            skill_classes=list(skills_encoder.classes_),
+            mean=mean,
+            scale=scale,
+        )
+        logger.info(f"✓ Built feature encoder ({encoder.n_features} features)")
+        return encoder
+
+    def has_gender(self, gender: str) -> bool:
+        """Check whether a gender label can be encoded."""
+        return gender in self.gender_codes
+
+    def _gender_code(self, gender: str) -> int:
+        """Get the label-encoded value of a gender."""
+        try:
+            return self.gender_codes[gender]
+        except KeyError:
+            raise ValueError(f"y contains previously unseen labels: '{gender}'")
+
+    def _columns(
+        self, interest_tokens: Iterable[str], skill_tokens: Iterable[str]
+    ) -> List[int]:
+        """Get the multi-hot columns set by the given tokens.
+
+        Unknown tokens are ignored, as MultiLabelBinarizer does.
+        """
+        columns = [
+            self.interest_columns[token]
+            for token in interest_tokens
+            if token in self.interest_columns
+        ]
+        columns.extend(
+            self.skill_columns[token]
+            for token in skill_tokens
+            if token in self.skill_columns
+        )
+        return columns
+
+    def apply_scaling(self, features: np.ndarray) -> np.ndarray:
+        """Apply the standard scaling to encoded features in place."""
+        features -= self.mean
+        features /= self.scale
+        return features
+
+    def encode_one(
+        self,
+        gender: str,
+        interest_tokens: Iterable[str],
+        skill_tokens: Iterable[str],
+        grades: float,
+    ) -> np.ndarray:
+        """Encode a single input without scaling it.
+
+        The result is written into a per-thread buffer that is reused by the
+        next call on the same thread; copy it if it must outlive that.
+
+        Args:
+            gender: Gender label
+            interest_tokens: Normalized interest tokens
+            skill_tokens: Normalized skill tokens
+            grades: CGPA or percentage
+
+        Returns:
+            Unscaled feature matrix of shape (1, n_features)
+        """
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._local.buffer = np.empty((1, self.n_features))
+
+        row = buffer[0]
+        row.fill(0.0)
+        row[0] = self._gender_code(gender)
+        row[1] = grades
+        row[self._columns(interest_tokens, skill_tokens)] = 1.0
+        return buffer
+
+    def transform(self, records: Sequence[Dict]) -> np.ndarray:
+        """Encode and scale a batch of inputs into a new matrix.
+
+        Args:
+            records: Dictionaries with gender, grades and the normalized
+                "interest_tokens" and "skill_tokens" lists
+
+        Returns:
+            Scaled feature matrix of shape (n_records, n_features)
+        """
+        return self.apply_scaling(self.encode(records))
+
+    def encode(self, records: Sequence[Dict]) -> np.ndarray:
+        """Encode a batch of inputs into a new, unscaled matrix.
+
+        Args:
+            records: Dictionaries with gender, grades and the normalized
+                "interest_tokens" and "skill_tokens" lists
+
+        Returns:
+            Unscaled feature matrix of shape (n_records, n_features)
+        """
+        features = np.zeros((len(records), self.n_features))
+        rows: List[int] = []
+        columns: List[int] = []
+        for i, record in enumerate(records):
+            features[i, 0] = self._gender_code(record["gender"])
+            features[i, 1] = record["grades"]
+            record_columns = self._columns(
+                record["interest_tokens"], record["skill_tokens"]
+            )
+            rows.extend([i] * len(record_columns))
+            columns.extend(record_columns)
+
+        features[rows, columns] = 1.0
+        return features
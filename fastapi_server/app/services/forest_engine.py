@@ -0,0 +1,321 @@
+"""Vectorized evaluation of the career Random Forest ensemble."""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+def resolve_forest(model):
+    """Return the fitted forest behind a saved model.
+
+    The grid-search artifacts (e.g. random_forest_grid2.sav) pickle the whole
+    GridSearchCV object; the forest itself lives in ``best_estimator_``.
+
+    Args:
+        model: Fitted RandomForestRegressor or a search object wrapping one
+
+    Returns:
+        The fitted forest
+    """
+    forest = getattr(model, "best_estimator_", model)
+    if not hasattr(forest, "estimators_"):
+        raise ValueError(f"{type(model).__name__} is not a fitted tree ensemble")
+    return forest
+
+
+@dataclass
+class EnsembleResult:
+    """Outputs of one vectorized pass over the forest for a batch of rows."""
+
+    point_estimates: np.ndarray  # (n_rows,) forest mean prediction
+    tree_predictions: np.ndarray  # (n_rows, n_trees) per-tree outputs
+    confidence: np.ndarray  # (n_rows,) 1 / (1 + std of tree outputs)
+    vote_counts: np.ndarray  # (n_rows, n_codes) histogram of rounded outputs
+
+    def top_votes(self, k: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the k most voted course codes for every row.
+
+        Ties are broken towards the higher course code, the same order the
+        previous ``np.unique`` + reversed ``argsort`` produced.
+
+        Args:
+            k: Number of codes to return per row
+
+        Returns:
+            Tuple of (codes, probabilities), both shaped (n_rows, k).
+            Slots without any vote have probability 0.
+        """
+        n_codes = self.vote_counts.shape[1]
+        # Stable sort on the reversed histogram puts higher codes first on ties
+        order = np.argsort(-self.vote_counts[:, ::-1], axis=1, kind="stable")[:, :k]
+        codes = n_codes - 1 - order
+        counts = np.take_along_axis(self.vote_counts, codes, axis=1)
+        return codes, counts / self.tree_predictions.shape[1]
+
+
+class ForestEngine:
+    """Base class for engines that evaluate every tree of a forest at once.
+
+    Subclasses only provide ``tree_outputs``; the mean, confidence and vote
+    histogram are derived from it here for the whole batch.
+    """
+
+    n_trees: int
+    n_features: int
+    n_codes: int
+
+    def tree_outputs(self, features: np.ndarray) -> np.ndarray:
+        """Get the prediction of every tree, shaped (n_trees, n_rows)."""
+        raise NotImplementedError
+
+    def evaluate(self, features: np.ndarray) -> EnsembleResult:
+        """Evaluate the ensemble for a batch of preprocessed rows.
+
+        Args:
+            features: Scaled feature matrix, shaped (n_rows, n_features)
+
+        Returns:
+            EnsembleResult with mean, per-tree outputs, confidence and votes
+        """
+        return self.summarize(self.tree_outputs(features))
+
+    def summarize(self, outputs: np.ndarray) -> EnsembleResult:
+        """Derive the mean, confidence and vote histogram from tree outputs.
+
+        Args:
+            outputs: Prediction of every tree, shaped (n_trees, n_rows)
+
+        Returns:
+            EnsembleResult with mean, per-tree outputs, confidence and votes
+        """
+        n_rows = outputs.shape[1]
+
+        # Summing over the leading axis accumulates tree by tree, the same
+        # order RandomForestRegressor.predict uses
+        point_estimates = outputs.sum(axis=0) / self.n_trees
+
+        tree_predictions = np.ascontiguousarray(outputs.T)
+        confidence = 1.0 / (1.0 + np.std(tree_predictions, axis=1))
+
+        # Histogram of rounded tree outputs; codes outside the course
+        # mapping are never reported, so they are not counted
+        codes = np.round(tree_predictions).astype(np.int64)
+        valid = (codes >= 0) & (codes < self.n_codes)
+        rows = np.broadcast_to(np.arange(n_rows)[:, None], codes.shape)
+        vote_counts = np.bincount(
+            (rows[valid] * self.n_codes + codes[valid]),
+            minlength=n_rows * self.n_codes,
+        ).reshape(n_rows, self.n_codes)
+
+        return EnsembleResult(
+            point_estimates=point_estimates,
+            tree_predictions=tree_predictions,
+            confidence=confidence,
+            vote_counts=vote_counts,
+        )
+
+
+class SklearnForestEngine(ForestEngine):
+    """Evaluates the fitted sklearn forest with a single ``apply`` call.
+
+    Instead of calling ``tree.predict`` once per estimator (each call paying
+    sklearn's input validation), the engine asks the forest for the leaf
+    reached in every tree at once and reads the leaf values from a table
+    built at load time.
+    """
+
+    def __init__(self, model, n_codes: int):
+        """Build the leaf value table.
+
+        Args:
+            model: Fitted forest (or search object wrapping one)
+            n_codes: Number of valid course codes for the vote histogram
+        """
+        self.forest = resolve_forest(model)
+        self.n_codes = n_codes
+        self.n_trees = len(self.forest.estimators_)
+        self.n_features = self.forest.n_features_in_
+
+        trees = [estimator.tree_ for estimator in self.forest.estimators_]
+        max_nodes = max(tree.node_count for tree in trees)
+
+        # Padded (n_trees, max_nodes) table of node values
+        self._node_values = np.zeros((self.n_trees, max_nodes), dtype=np.float64)
+        for i, tree in enumerate(trees):
+            self._node_values[i, : tree.node_count] = tree.value[:, 0, 0]
+        self._tree_index = np.arange(self.n_trees)[:, None]
+
+        logger.info(
+            f"✓ Built sklearn forest engine ({self.n_trees} trees, {max_nodes} max nodes)"
+        )
+
+    def tree_outputs(self, features: np.ndarray) -> np.ndarray:
+        """Get the prediction of every tree, shaped (n_trees, n_rows)."""
+        leaves = self.forest.apply(features)  # (n_rows, n_trees)
+        return self._node_values[self._tree_index, leaves.T]
+
+
+class FlatForestEngine(ForestEngine):
+    """Traverses all trees of the forest from flat, contiguous node arrays.
+
+    Every node of every tree is packed into shared arrays (split feature,
+    threshold, left/right child, value), with child indices global to the
+    packed arrays. Leaves point to themselves, so all (tree, row) pairs can
+    be stepped together, one tree level per iteration, without any per-tree
+    Python objects; pairs that reach a leaf early drop out of the active set.
+    Comparisons follow sklearn exactly: rows are cast to float32 and compared
+    with ``<=`` against the float64 thresholds.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        missing_left: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        n_features: int,
+        n_codes: int,
+    ):
+        """Wrap already packed node arrays.
+
+        Args:
+            feature: Split feature per node (0 for leaves)
+            threshold: Split threshold per node
+            left: Global index of the left child (self for leaves)
+            right: Global index of the right child (self for leaves)
+            value: Prediction stored at each node
+            missing_left: Whether NaN goes to the left child at each node
+            roots: Global index of the root of each tree
+            max_depth: Depth of the deepest tree
+            n_features: Number of input features
+            n_codes: Number of valid course codes for the vote histogram
+        """
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.missing_left = missing_left
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.n_features = int(n_features)
+        self.n_codes = n_codes
+        self.n_trees = len(roots)
+        self._handles_missing = bool(np.any(missing_left))
+        self._is_leaf = left == np.arange(len(left))
+
+    @classmethod
+    def from_forest(cls, model, n_codes: int) -> "FlatForestEngine":
+        """Pack the trees of a fitted sklearn forest into flat arrays.
+
+        Args:
+            model: Fitted forest (or search object wrapping one)
+            n_codes: Number of valid course codes for the vote histogram
+
+        Returns:
+            FlatForestEngine holding no reference to the sklearn objects
+        """
+        forest = resolve_forest(model)
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        n_nodes = int(offsets[-1])
+
+        feature = np.zeros(n_nodes, dtype=np.intp)
+        threshold = np.zeros(n_nodes, dtype=np.float64)
+        left = np.zeros(n_nodes, dtype=np.intp)
+        right = np.zeros(n_nodes, dtype=np.intp)
+        value = np.zeros(n_nodes, dtype=np.float64)
+        missing_left = np.zeros(n_nodes, dtype=bool)
+
+        for tree, start, end in zip(trees, offsets[:-1], offsets[1:]):
+            nodes = np.arange(start, end)
+            is_leaf = tree.children_left < 0
+            feature[start:end] = np.where(is_leaf, 0, tree.feature)
+            threshold[start:end] = tree.threshold
+            left[start:end] = np.where(is_leaf, nodes, tree.children_left + start)
+            right[start:end] = np.where(is_leaf, nodes, tree.children_right + start)
+            value[start:end] = tree.value[:, 0, 0]
+            if hasattr(tree, "missing_go_to_left"):
+                missing_left[start:end] = ~is_leaf & (tree.missing_go_to_left == 1)
+
+        engine = cls(
+            feature=feature,
+            threshold=threshold,
+            left=left,
+            right=right,
+            value=value,
+            missing_left=missing_left,
+            roots=offsets[:-1].astype(np.intp),
+            max_depth=max(tree.max_depth for tree in trees),
+            n_features=forest.n_features_in_,
+            n_codes=n_codes,
+        )
+        logger.info(
+            f"✓ Built flat forest engine ({engine.n_trees} trees, {n_nodes} nodes, "
+            f"depth {engine.max_depth})"
+        )
+        return engine
+
+    def tree_outputs(self, features: np.ndarray) -> np.ndarray:
+        """Get the prediction of every tree, shaped (n_trees, n_rows)."""
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim != 2 or features.shape[1] != self.n_features:
+            raise ValueError(
+                f"Expected {self.n_features} features, got shape {features.shape}"
+            )
+
+        n_rows = features.shape[0]
+        flat_features = np.ascontiguousarray(features).ravel()
+
+        # One entry per (tree, row) pair, tree-major; each holds the offset of
+        # its row in flat_features and its current node
+        row_offsets = np.tile(np.arange(n_rows) * self.n_features, self.n_trees)
+        nodes = np.repeat(self.roots, n_rows)
+
+        # Only step the pairs that have not reached a leaf yet
+        active = np.flatnonzero(~self._is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            values = flat_features[row_offsets[active] + self.feature[current]]
+            go_left = values <= self.threshold[current]
+            if self._handles_missing:
+                go_left |= np.isnan(values) & self.missing_left[current]
+            current = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = current
+            active = active[~self._is_leaf[current]]
+
+        nodes = nodes.reshape(self.n_trees, n_rows)
+        return self.value[nodes]
+
+
+FOREST_ENGINES = {
+    "sklearn": SklearnForestEngine,
+    "flat": FlatForestEngine.from_forest,
+}
+
+
+def build_forest_engine(model, kind: str, n_codes: int) -> ForestEngine:
+    """Create the forest engine selected in settings.
+
+    Args:
+        model: Fitted forest (or search object wrapping one)
+        kind: Engine name, one of FOREST_ENGINES
+        n_codes: Number of valid course codes for the vote histogram
+
+    Returns:
+        ForestEngine ready to evaluate batches
+    """
+    if kind not in FOREST_ENGINES:
+        raise ValueError(
+            f"Unknown forest engine '{kind}', expected one of {sorted(FOREST_ENGINES)}"
+        )
+    return FOREST_ENGINES[kind](model, n_codes=n_codes)
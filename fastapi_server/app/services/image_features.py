@@ -0,0 +1,60 @@
+"""Per-image feature bundles used by the hybrid image comparison."""
+
+import hashlib
+from dataclasses import dataclass, replace
+from typing import Iterable, Optional
+
+import numpy as np
+
+# Fields of ImageFeatures that the similarity metrics read
+FEATURE_FIELDS = ("gray", "edges", "histogram", "embedding")
+
+
+def content_key(data: bytes) -> str:
+    """Content hash identifying an uploaded image.
+
+    Args:
+        data: Raw (encoded) image bytes
+
+    Returns:
+        Hex digest of the bytes
+    """
+    return hashlib.blake2b(data, digest_size=20).hexdigest()
+
+
+@dataclass
+class ImageFeatures:
+    """Everything the similarity metrics need from one image.
+
+    Only the fields needed by the metrics of the scoring profile in use are
+    computed; the others stay None until a profile needs them.
+
+    Attributes:
+        gray: 224x224 grayscale image (uint8)
+        edges: Canny edge map of ``gray`` (uint8)
+        histogram: Normalized, flattened 8x8x8 color histogram (float32)
+        embedding: Unit-norm CLIP image embedding (float32), or None if the
+            CLIP branch has not been needed for this image yet
+        rgb: Decoded full-size RGB pixels (uint8), or None once the bundle
+            has been stored; only the extraction pass needs them
+    """
+
+    gray: Optional[np.ndarray] = None
+    edges: Optional[np.ndarray] = None
+    histogram: Optional[np.ndarray] = None
+    embedding: Optional[np.ndarray] = None
+    rgb: Optional[np.ndarray] = None
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays of the bundle."""
+        arrays = (self.gray, self.edges, self.histogram, self.embedding, self.rgb)
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def has(self, fields: Iterable[str]) -> bool:
+        """Check whether all the given fields have been computed."""
+        return all(getattr(self, field) is not None for field in fields)
+
+    def without_rgb(self) -> "ImageFeatures":
+        """Copy of the bundle that does not keep the RGB pixels alive."""
+        return replace(self, rgb=None) if self.rgb is not None else self
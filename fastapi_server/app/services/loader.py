@@ -0,0 +1,178 @@
+"""Lazy, background loading of the ML model services.
+
+Importing this module is cheap: the model services (and torch, CLIP and
+sklearn with them) are only imported when ``load`` runs, which the app
+lifespan does in background threads for the enabled subsystems. Request
+handlers get the services through ``get_career_predictor`` and
+``get_clip_service``, which raise ModelNotLoadedError until the model is
+ready instead of blocking. A failed load is attempted again once
+``settings.model_load_retry_seconds`` have passed.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+from app.core.exceptions import ModelNotLoadedError
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelLoader:
+    """Loads one model service on first request to ``load`` and tracks it."""
+
+    def __init__(self, name: str, factory: Callable[[], Any]):
+        """Configure the loader; nothing is imported or loaded yet.
+
+        Args:
+            name: Model name used in status reports
+            factory: Imports and returns the loaded service
+        """
+        self.name = name
+        self._factory = factory
+        self._instance: Optional[Any] = None
+        self._lock = threading.Lock()
+        self.status = PENDING
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.failed_at: Optional[float] = None
+
+    @property
+    def retry_due(self) -> bool:
+        """Whether a failed load may be attempted again."""
+        retry_seconds = settings.model_load_retry_seconds
+        return (
+            self.status == FAILED
+            and retry_seconds > 0
+            and time.monotonic() - self.failed_at >= retry_seconds
+        )
+
+    def load(self) -> Optional[Any]:
+        """Load the service (blocking); later calls return the same result.
+
+        After a failure, calls within ``settings.model_load_retry_seconds``
+        return None and the first call after that loads again.
+
+        Returns:
+            The loaded service, or None if loading failed
+        """
+        with self._lock:
+            if self.status == READY or (self.status == FAILED and not self.retry_due):
+                return self._instance
+
+            self.status = LOADING
+            start = time.perf_counter()
+            try:
+                instance = self._factory()
+            except Exception as e:
+                self.error = str(e)
+                self.status = FAILED
+                self.failed_at = time.monotonic()
+                logger.error(f"✗ Failed to load {self.name} model: {str(e)}")
+            else:
+                self._instance = instance
+                self.error = None
+                self.status = READY
+                logger.info(f"✓ {self.name} model ready")
+            self.load_seconds = time.perf_counter() - start
+            return self._instance
+
+    async def load_in_background(self) -> Optional[Any]:
+        """Load the service on a worker thread without blocking the event loop."""
+        return await asyncio.to_thread(self.load)
+
+    async def load_until_ready(self) -> Optional[Any]:
+        """Load the service in the background, retrying after each failure.
+
+        Gives up after the first failure if retries are disabled
+        (``settings.model_load_retry_seconds`` is 0).
+
+        Returns:
+            The loaded service, or None if loading failed for good
+        """
+        while True:
+            instance = await self.load_in_background()
+            if instance is not None or settings.model_load_retry_seconds <= 0:
+                return instance
+            logger.info(
+                f"Retrying {self.name} model load in "
+                f"{settings.model_load_retry_seconds:g}s"
+            )
+            await asyncio.sleep(settings.model_load_retry_seconds)
+
+    @property
+    def ready(self) -> bool:
+        """Whether the service is loaded."""
+        return self.status == READY
+
+    def peek(self) -> Optional[Any]:
+        """Get the service if it is loaded, otherwise None."""
+        return self._instance if self.status == READY else None
+
+    def get(self) -> Any:
+        """Get the loaded service.
+
+        Raises:
+            ModelNotLoadedError: If the service is not (yet) loaded
+        """
+        if self.status != READY:
+            detail = f": {self.error}" if self.error else ""
+            raise ModelNotLoadedError(f"{self.name} model is {self.status}{detail}")
+        return self._instance
+
+    def state(self) -> Dict[str, Any]:
+        """Get the loading status for readiness reports."""
+        return {
+            "status": self.status,
+            "error": self.error,
+            "load_seconds": self.load_seconds,
+        }
+
+
+def _load_career_predictor():
+    from app.services.career_service import career_predictor
+
+    if not career_predictor.is_loaded():
+        raise ModelNotLoadedError("Career models not loaded properly")
+    return career_predictor
+
+
+def _load_clip_service():
+    from app.services.clip_service import clip_service
+
+    if not clip_service.is_loaded():
+        raise ModelNotLoadedError("CLIP model not loaded")
+    return clip_service
+
+
+career_loader = ModelLoader("Career", _load_career_predictor)
+clip_loader = ModelLoader("CLIP", _load_clip_service)
+
+# Loaders of the enabled subsystems, keyed by the name used in readiness
+# reports; disabled subsystems are never loaded (nor their libraries imported)
+MODEL_LOADERS: Dict[str, ModelLoader] = {
+    name: loader
+    for name, loader, enabled in (
+        ("career", career_loader, settings.enable_career),
+        ("clip", clip_loader, settings.enable_clip),
+    )
+    if enabled
+}
+
+
+def get_career_predictor():
+    """Get the loaded career predictor (raises ModelNotLoadedError if not ready)."""
+    return career_loader.get()
+
+
+def get_clip_service():
+    """Get the loaded CLIP service (raises ModelNotLoadedError if not ready)."""
+    return clip_loader.get()
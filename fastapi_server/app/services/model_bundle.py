@@ -0,0 +1,170 @@
+"""Pickle-free, memory-mappable bundles of the career models."""
+
+import json
+import os
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.core.logging import get_logger
+from app.services.feature_encoder import FeatureEncoder
+from app.services.forest_engine import FlatForestEngine
+
+logger = get_logger(__name__)
+
+MANIFEST = "manifest.json"
+BUNDLE_FORMAT = "career-model-bundle"
+BUNDLE_FORMAT_VERSION = 1
+
+# Node arrays of FlatForestEngine, each saved as forest_<name>.npy
+_FOREST_ARRAYS = ("feature", "threshold", "left", "right", "value", "missing_left")
+_INDEX_ARRAYS = ("feature", "left", "right")
+
+
+def is_bundle(path: Path) -> bool:
+    """Check whether a directory holds a model bundle."""
+    return (Path(path) / MANIFEST).exists()
+
+
+def save_bundle(
+    path: Path,
+    feature_encoder: FeatureEncoder,
+    forest_engine: FlatForestEngine,
+    course_mapping: Dict[int, str],
+    metadata: Optional[Dict] = None,
+) -> Dict:
+    """Write the career models as a directory of ``.npy`` arrays.
+
+    Vocabularies, the course mapping and the scalar parameters go into
+    ``manifest.json``; the scaler statistics and the packed tree arrays are
+    written as ``.npy`` files. The bundle is written to a temporary directory
+    and renamed into place, replacing any previous bundle.
+
+    Args:
+        path: Bundle directory to create
+        feature_encoder: Encoder holding the vocabularies and scaler statistics
+        forest_engine: Flat forest engine holding the packed trees
+        course_mapping: Course code -> course name
+        metadata: Extra JSON-serializable fields stored in the manifest
+
+    Returns:
+        The written manifest
+    """
+    path = Path(path)
+    manifest = {
+        "format": BUNDLE_FORMAT,
+        "format_version": BUNDLE_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "n_features": forest_engine.n_features,
+        "n_trees": forest_engine.n_trees,
+        "n_nodes": len(forest_engine.value),
+        "max_depth": forest_engine.max_depth,
+        "gender_classes": feature_encoder.gender_classes,
+        "interest_classes": feature_encoder.interest_classes,
+        "skill_classes": feature_encoder.skill_classes,
+        "course_mapping": {str(code): name for code, name in course_mapping.items()},
+        **(metadata or {}),
+    }
+    arrays = {
+        "scaler_mean": feature_encoder.mean,
+        "scaler_scale": feature_encoder.scale,
+        "forest_roots": forest_engine.roots.astype(np.int64),
+    }
+    for name in _FOREST_ARRAYS:
+        array = getattr(forest_engine, name)
+        arrays[f"forest_{name}"] = (
+            array.astype(np.int64) if name in _INDEX_ARRAYS else array
+        )
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staging = path.parent / f".tmp-{path.name}-{uuid.uuid4().hex}"
+    staging.mkdir()
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", np.ascontiguousarray(array))
+        (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+        if path.exists():
+            shutil.rmtree(path)
+        os.replace(staging, path)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    logger.info(f"✓ Saved career model bundle to {path}")
+    return manifest
+
+
+def load_bundle(
+    path: Path,
+) -> Tuple[FeatureEncoder, FlatForestEngine, Dict[int, str], Dict]:
+    """Open a model bundle with its arrays memory-mapped.
+
+    The arrays are opened with ``np.load(mmap_mode="r")``, so worker
+    processes on one host share their pages through the OS page cache and
+    nothing is unpickled.
+
+    Args:
+        path: Bundle directory written by save_bundle
+
+    Returns:
+        Tuple of (feature encoder, forest engine, course mapping, manifest)
+    """
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST).read_text())
+    if manifest.get("format") != BUNDLE_FORMAT:
+        raise ValueError(f"{path} is not a career model bundle")
+    if manifest.get("format_version") != BUNDLE_FORMAT_VERSION:
+        raise ValueError(
+            f"Unsupported bundle format version {manifest.get('format_version')}"
+        )
+
+    def array(name: str) -> np.ndarray:
+        return np.load(path / f"{name}.npy", mmap_mode="r", allow_pickle=False)
+
+    course_mapping = {
+        int(code): name for code, name in manifest["course_mapping"].items()
+    }
+    feature_encoder = FeatureEncoder(
+        gender_classes=manifest["gender_classes"],
+        interest_classes=manifest["interest_classes"],
+        skill_classes=manifest["skill_classes"],
+        mean=array("scaler_mean"),
+        scale=array("scaler_scale"),
+    )
+
+    nodes = {name: array(f"forest_{name}") for name in _FOREST_ARRAYS}
+    roots = array("forest_roots")
+    n_nodes = manifest["n_nodes"]
+    if any(len(values) != n_nodes for values in nodes.values()):
+        raise ValueError(f"Bundle forest arrays do not all have {n_nodes} nodes")
+    if len(roots) != manifest["n_trees"]:
+        raise ValueError(
+            f"Bundle has {len(roots)} roots for {manifest['n_trees']} trees"
+        )
+    # Traversal indexes with these arrays, so reject out-of-range entries
+    limits = {
+        "feature": manifest["n_features"],
+        "left": n_nodes,
+        "right": n_nodes,
+        "roots": n_nodes,
+    }
+    for name, limit in limits.items():
+        values = roots if name == "roots" else nodes[name]
+        if len(values) and (values.min() < 0 or values.max() >= limit):
+            raise ValueError(f"Bundle forest array '{name}' is out of range")
+
+    forest_engine = FlatForestEngine(
+        **nodes,
+        roots=roots,
+        max_depth=manifest["max_depth"],
+        n_features=manifest["n_features"],
+        n_codes=len(course_mapping),
+    )
+    logger.info(
+        f"✓ Opened career model bundle {path} ({forest_engine.n_trees} trees, "
+        f"{n_nodes} nodes, memory-mapped)"
+    )
+    return feature_encoder, forest_engine, course_mapping, manifest
@@ -0,0 +1,143 @@
+"""Versioned career model files under ``models_dir``."""
+
+import os
+import re
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.exceptions import ModelVersionNotFoundError
+from app.services.model_bundle import is_bundle
+
+# File name of each career model artifact within a version directory;
+# "bundle" is the directory written by export_career_bundle.py
+MODEL_FILES = {
+    "random_forest": "rf.sav",
+    "random_forest_grid": "random_forest_grid2.sav",
+    "scaler": "sc.sav",
+    "mlb_interest": "mlb_interest.pkl",
+    "mlb_skills": "mlb_skills.pkl",
+    "bundle": "bundle",
+}
+
+# File in the root naming the version all workers should serve
+ACTIVE_VERSION_FILE = "ACTIVE_VERSION"
+
+_VERSION = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+
+def _version_key(version: str) -> List:
+    """Natural sort key, so that v1.10.0 sorts after v1.9.0."""
+    return [
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in re.split(r"(\d+)", version)
+        if part
+    ]
+
+
+class ModelRegistry:
+    """Lists and resolves the model versions stored under a root directory.
+
+    Each version lives in ``<root>/<version>/`` with the files of
+    ``MODEL_FILES``. Model files placed directly in the root (the original
+    layout) are served as ``default_version``.
+
+    ``<root>/ACTIVE_VERSION`` records the version chosen by the last reload,
+    so that every worker process serving from the root agrees on it.
+    """
+
+    def __init__(self, root: Path, default_version: str):
+        """Create the registry.
+
+        Args:
+            root: Directory holding one subdirectory per model version
+            default_version: Version name of model files directly in root
+        """
+        self.root = Path(root)
+        self.default_version = default_version
+
+    @staticmethod
+    def is_valid_version(version: str) -> bool:
+        """Check that a version name is safe to use as a directory name."""
+        return bool(_VERSION.match(version)) and version not in (".", "..")
+
+    @staticmethod
+    def _has_model(path: Path) -> bool:
+        return (
+            (path / MODEL_FILES["random_forest"]).exists()
+            or (path / MODEL_FILES["random_forest_grid"]).exists()
+            or is_bundle(path / MODEL_FILES["bundle"])
+        )
+
+    def versions(self) -> List[str]:
+        """Get the available versions, oldest first."""
+        versions = set()
+        if self.root.is_dir():
+            versions.update(
+                path.name
+                for path in self.root.iterdir()
+                if path.is_dir()
+                and self.is_valid_version(path.name)
+                and self._has_model(path)
+            )
+        if self._has_model(self.root):
+            versions.add(self.default_version)
+        return sorted(versions, key=_version_key)
+
+    def latest(self) -> Optional[str]:
+        """Get the newest version, or None if there are no models."""
+        versions = self.versions()
+        return versions[-1] if versions else None
+
+    def path(self, version: str) -> Path:
+        """Get the directory holding a version.
+
+        Raises:
+            ModelVersionNotFoundError: If the version does not exist
+        """
+        if self.is_valid_version(version):
+            path = self.root / version
+            if self._has_model(path):
+                return path
+            if version == self.default_version and self._has_model(self.root):
+                return self.root
+        raise ModelVersionNotFoundError(f"Model version not found: {version}")
+
+    def active_version_stamp(self) -> Optional[Tuple[int, str]]:
+        """Get the (mtime in ns, version) of the active version marker.
+
+        Returns:
+            None if there is no marker or it names no valid version
+        """
+        marker = self.root / ACTIVE_VERSION_FILE
+        try:
+            mtime = marker.stat().st_mtime_ns
+            version = marker.read_text().strip()
+        except OSError:
+            return None
+        return (mtime, version) if self.is_valid_version(version) else None
+
+    def active_version(self) -> Optional[str]:
+        """Get the version named by the active version marker, if it exists."""
+        stamp = self.active_version_stamp()
+        if stamp is None:
+            return None
+        try:
+            self.path(stamp[1])
+        except ModelVersionNotFoundError:
+            return None
+        return stamp[1]
+
+    def set_active_version(self, version: str) -> None:
+        """Atomically point the active version marker at a version."""
+        staging = self.root / f".{ACTIVE_VERSION_FILE}-{uuid.uuid4().hex}"
+        try:
+            staging.write_text(f"{version}\n")
+            os.replace(staging, self.root / ACTIVE_VERSION_FILE)
+        finally:
+            staging.unlink(missing_ok=True)
+
+    def model_paths(self, version: str) -> Dict[str, Path]:
+        """Get the path of every model file of a version."""
+        path = self.path(version)
+        return {name: path / filename for name, filename in MODEL_FILES.items()}
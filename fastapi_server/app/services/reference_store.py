@@ -0,0 +1,148 @@
+"""On-disk registry of precomputed reference image features."""
+
+import json
+import os
+import re
+import shutil
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+from app.core.cache import LRUCache
+from app.core.logging import get_logger
+from app.services.image_features import FEATURE_FIELDS, ImageFeatures
+
+logger = get_logger(__name__)
+
+_REFERENCE_ID = re.compile(r"^[0-9a-f]{40}$")
+_ARRAYS = FEATURE_FIELDS
+
+
+class ReferenceStore:
+    """Persists reference image feature bundles as ``.npy`` files.
+
+    Each reference lives in ``<root>/<reference_id>/`` with one ``.npy`` file
+    per array and a ``meta.json``. Bundles are opened with
+    ``np.load(mmap_mode="r")``, so the arrays are paged in from the OS page
+    cache (and shared between worker processes) instead of being copied into
+    every worker.
+
+    Open bundles are kept in a bounded LRU cache and revalidated against
+    ``meta.json`` on every load, so a reference deleted (or re-registered)
+    through another worker is never served from a stale memory map.
+    """
+
+    def __init__(self, root: Path, max_loaded: int = 1024):
+        """Create the store.
+
+        Args:
+            root: Directory holding one subdirectory per reference
+            max_loaded: Maximum number of open bundles kept in memory
+        """
+        self.root = Path(root)
+        # reference_id -> (meta.json mtime in ns, ImageFeatures)
+        self._loaded = LRUCache(max_entries=max_loaded)
+
+    @staticmethod
+    def is_valid_id(reference_id: str) -> bool:
+        """Check that a reference id has the content-hash format."""
+        return bool(_REFERENCE_ID.match(reference_id))
+
+    def _path(self, reference_id: str) -> Path:
+        if not self.is_valid_id(reference_id):
+            raise ValueError(f"Invalid reference id: {reference_id}")
+        return self.root / reference_id
+
+    def exists(self, reference_id: str) -> bool:
+        """Check whether a reference is registered."""
+        return (self._path(reference_id) / "meta.json").exists()
+
+    def save(self, reference_id: str, features: ImageFeatures, metadata: Dict) -> Dict:
+        """Persist a reference bundle (no-op if it is already registered).
+
+        The bundle is written to a temporary directory and renamed into
+        place, so readers never see a partially written reference.
+
+        Args:
+            reference_id: Content hash of the reference image
+            features: Feature bundle, including the CLIP embedding
+            metadata: Extra JSON-serializable fields stored in meta.json
+
+        Returns:
+            The stored metadata
+        """
+        target = self._path(reference_id)
+        if self.exists(reference_id):
+            return self.metadata(reference_id)
+
+        meta = {
+            "reference_id": reference_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **metadata,
+        }
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = self.root / f".tmp-{reference_id}-{uuid.uuid4().hex}"
+        staging.mkdir()
+        try:
+            for name in _ARRAYS:
+                np.save(
+                    staging / f"{name}.npy",
+                    np.ascontiguousarray(getattr(features, name)),
+                )
+            (staging / "meta.json").write_text(json.dumps(meta, indent=2))
+            os.replace(staging, target)
+        except OSError:
+            # Lost a race with a concurrent registration of the same image
+            if not self.exists(reference_id):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        logger.info(f"✓ Registered reference image {reference_id}")
+        return self.metadata(reference_id)
+
+    def load(self, reference_id: str) -> Optional[ImageFeatures]:
+        """Open a reference bundle memory-mapped, or None if it is unknown."""
+        path = self._path(reference_id)
+        try:
+            mtime = (path / "meta.json").stat().st_mtime_ns
+        except FileNotFoundError:
+            # Deleted, possibly by another worker
+            self._loaded.discard(reference_id)
+            return None
+
+        cached = self._loaded.get(reference_id)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            features = ImageFeatures(
+                **{
+                    name: np.load(path / f"{name}.npy", mmap_mode="r")
+                    for name in _ARRAYS
+                }
+            )
+        except FileNotFoundError:
+            # Deleted while opening
+            return None
+        self._loaded.put(reference_id, (mtime, features))
+        return features
+
+    def metadata(self, reference_id: str) -> Optional[Dict]:
+        """Get the stored metadata of a reference, or None if it is unknown."""
+        if not self.exists(reference_id):
+            return None
+        return json.loads((self._path(reference_id) / "meta.json").read_text())
+
+    def delete(self, reference_id: str) -> bool:
+        """Remove a reference; returns False if it was not registered."""
+        if not self.exists(reference_id):
+            return False
+        self._loaded.discard(reference_id)
+        shutil.rmtree(self._path(reference_id))
+        logger.info(f"✓ Deleted reference image {reference_id}")
+        return True
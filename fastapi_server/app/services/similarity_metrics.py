@@ -0,0 +1,80 @@
+"""Registry of the pairwise metrics combined into the hybrid image similarity."""
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+import cv2
+import numpy as np
+from skimage.metrics import structural_similarity as ssim
+
+from app.services.image_features import ImageFeatures
+
+
+@dataclass(frozen=True)
+class SimilarityMetric:
+    """A pairwise image metric and the feature bundle fields it reads.
+
+    Attributes:
+        name: Name used as the key in scoring profiles
+        compute: Maps two feature bundles to a score in [0, 1]
+        requires: ImageFeatures fields that must be extracted for the metric
+    """
+
+    name: str
+    compute: Callable[[ImageFeatures, ImageFeatures], float]
+    requires: Tuple[str, ...]
+
+
+METRICS: Dict[str, SimilarityMetric] = {}
+
+
+def register_metric(name: str, requires: Iterable[str]):
+    """Decorator registering a metric function under a profile name.
+
+    Args:
+        name: Name used in scoring profiles
+        requires: ImageFeatures fields the function reads
+    """
+
+    def decorator(func: Callable[[ImageFeatures, ImageFeatures], float]):
+        METRICS[name] = SimilarityMetric(name, func, tuple(requires))
+        return func
+
+    return decorator
+
+
+def required_fields(metric_names: Iterable[str]) -> Set[str]:
+    """Get the ImageFeatures fields needed to compute the given metrics."""
+    return {field for name in metric_names for field in METRICS[name].requires}
+
+
+@register_metric("clip", requires=("embedding",))
+def clip_similarity(features1: ImageFeatures, features2: ImageFeatures) -> float:
+    """Compute CLIP semantic similarity."""
+    # Embeddings are unit-norm, so the dot product is the cosine similarity
+    similarity = float(np.dot(features1.embedding, features2.embedding))
+    return max(0.0, min(1.0, similarity))
+
+
+@register_metric("ssim", requires=("gray",))
+def structural_similarity(features1: ImageFeatures, features2: ImageFeatures) -> float:
+    """Compute SSIM (Structural Similarity Index) for pixel-level comparison."""
+    score, _ = ssim(features1.gray, features2.gray, full=True)
+    return max(0.0, min(1.0, score))
+
+
+@register_metric("edge", requires=("edges",))
+def edge_similarity(features1: ImageFeatures, features2: ImageFeatures) -> float:
+    """Compute edge-based similarity for outline comparison."""
+    # Compute SSIM on Canny edges
+    score, _ = ssim(features1.edges, features2.edges, full=True)
+    return max(0.0, min(1.0, score))
+
+
+@register_metric("histogram", requires=("histogram",))
+def histogram_similarity(features1: ImageFeatures, features2: ImageFeatures) -> float:
+    """Compute color histogram correlation."""
+    correlation = cv2.compareHist(
+        features1.histogram, features2.histogram, cv2.HISTCMP_CORREL
+    )
+    return max(0.0, min(1.0, correlation))
@@ -0,0 +1,75 @@
+"""Export a career model version to a pickle-free, memory-mappable bundle.
+
+Reads the joblib files of a registry version (random forest, scaler and
+MultiLabelBinarizers) and writes <version dir>/bundle/: a manifest.json with
+the vocabularies and course mapping plus .npy files holding the scaler
+statistics and the flattened trees. The server then opens the bundle with
+np.load(mmap_mode="r") instead of unpickling (see CAREER_MODEL_BUNDLE).
+
+Usage: python export_career_bundle.py [version]
+"""
+
+import sys
+
+import joblib
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+from app.config import settings
+from app.services.feature_encoder import FeatureEncoder
+from app.services.forest_engine import FlatForestEngine
+from app.services.model_bundle import load_bundle, save_bundle
+from app.services.model_registry import ModelRegistry
+
+registry = ModelRegistry(settings.models_dir, settings.career_default_model_version)
+version = sys.argv[1] if len(sys.argv) > 1 else registry.latest()
+if version is None:
+    sys.exit(f"No career models found in {settings.models_dir}")
+model_paths = registry.model_paths(version)
+
+rf_path = model_paths["random_forest"]
+if not rf_path.exists():
+    rf_path = model_paths["random_forest_grid"]
+n_codes = len(settings.course_mapping)
+forest_engine = FlatForestEngine.from_forest(joblib.load(rf_path), n_codes=n_codes)
+
+# The gender encoder was never saved; the server fits it the same way
+gender_encoder = LabelEncoder().fit(["Female", "Male"])
+feature_encoder = FeatureEncoder.from_sklearn(
+    gender_encoder,
+    joblib.load(model_paths["mlb_interest"]),
+    joblib.load(model_paths["mlb_skills"]),
+    joblib.load(model_paths["scaler"]),
+)
+if feature_encoder.n_features != forest_engine.n_features:
+    sys.exit(
+        f"Encoders produce {feature_encoder.n_features} features, "
+        f"model expects {forest_engine.n_features}"
+    )
+
+save_bundle(
+    model_paths["bundle"],
+    feature_encoder,
+    forest_engine,
+    settings.course_mapping,
+    metadata={"version": version, "source": rf_path.name},
+)
+
+# Round-trip check: the bundle must score exactly like the pickled models
+bundle_encoder, bundle_engine, _, _ = load_bundle(model_paths["bundle"])
+rng = np.random.default_rng(0)
+records = [
+    {
+        "gender": gender,
+        "interest_tokens": rng.choice(feature_encoder.interest_classes, 3),
+        "skill_tokens": rng.choice(feature_encoder.skill_classes, 5),
+        "grades": float(grades),
+    }
+    for gender, grades in zip(["Female", "Male"] * 50, rng.uniform(40, 100, 100))
+]
+expected = forest_engine.tree_outputs(feature_encoder.transform(records))
+actual = bundle_engine.tree_outputs(bundle_encoder.transform(records))
+if not np.array_equal(expected, actual):
+    sys.exit("Bundle predictions differ from the pickled models")
+
+print(f"Saved career model bundle for {version} to {model_paths['bundle']}")
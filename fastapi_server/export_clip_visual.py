@@ -0,0 +1,32 @@
+"""Export the CLIP ViT-B/32 visual tower to a local visual-only state dict.
+
+The FastAPI server only encodes images, so it can start from this file
+(set CLIP_VISUAL_WEIGHTS) instead of downloading and loading the full
+checkpoint with its text encoder.
+
+Usage: python export_clip_visual.py [output_path]
+"""
+
+import sys
+from pathlib import Path
+
+import clip
+import torch
+
+output_path = (
+    Path(sys.argv[1])
+    if len(sys.argv) > 1
+    else Path(__file__).parent / "Models" / "clip_vit_b32_visual.pt"
+)
+
+model, _ = clip.load("ViT-B/32", device="cpu", jit=False)
+
+# fp16 halves the file; the server converts back to fp32 on CPU
+state_dict = {name: tensor.half() for name, tensor in model.visual.state_dict().items()}
+
+output_path.parent.mkdir(parents=True, exist_ok=True)
+torch.save(state_dict, output_path)
+
+n_params = sum(tensor.numel() for tensor in state_dict.values())
+print(f"Visual parameters: {n_params:,}")
+print(f"Saved visual-only state dict to {output_path}")
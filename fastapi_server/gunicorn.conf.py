@@ -0,0 +1,69 @@
+"""Gunicorn configuration for multi-worker serving with pre-fork model loading.
+
+Run from fastapi_server/:
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+The master imports the app and loads the enabled models once, then forks
+the Uvicorn workers. The workers inherit the model memory copy-on-write, so
+the CLIP weights and the career arrays are resident once per node instead of
+once per worker. ``python measure_worker_memory.py <master pid>`` reports the
+shared and unique memory of every process.
+
+Plain ``uvicorn --workers`` spawns fresh interpreters instead of forking,
+so each worker loads its own copy of the models there.
+"""
+
+import gc
+import os
+import sys
+
+from app.config import settings
+
+bind = os.environ.get("GUNICORN_BIND", f"{settings.host}:{settings.port}")
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Workers only start serving once forked; CLIP loading is done by then
+timeout = 120
+
+# The master must not start an OpenMP thread team before forking: a worker
+# then using more than one torch thread deadlocks in its first parallel op.
+# Models are loaded single-threaded and the pools sized after the fork.
+worker_torch_threads = settings.torch_num_threads
+worker_cv2_threads = settings.cv2_num_threads
+settings.torch_num_threads = 1
+settings.cv2_num_threads = 1
+
+# No collections in the master: they would free objects between long-lived
+# ones, and the holes get reused later, dirtying shared pages
+gc.disable()
+
+
+def on_starting(server):
+    """Load the models of the enabled subsystems before forking."""
+    from app.services.loader import MODEL_LOADERS
+
+    for name, loader in MODEL_LOADERS.items():
+        if loader.load() is None:
+            server.log.warning(f"{name} model failed to load: {loader.error}")
+
+    # Move every object allocated so far out of the collector's reach, so
+    # collections in the workers never write to the inherited object headers
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Re-enable the collector and size the intra-op thread pools per worker."""
+    gc.enable()
+
+    # Split the cores between the workers unless a thread count is set
+    threads = max(1, (os.cpu_count() or 1) // server.cfg.workers)
+    if "torch" in sys.modules:
+        import torch
+
+        torch.set_num_threads(worker_torch_threads or threads)
+    if "cv2" in sys.modules:
+        import cv2
+
+        cv2.setNumThreads(worker_cv2_threads or threads)
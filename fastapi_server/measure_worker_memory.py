@@ -0,0 +1,64 @@
+"""Report the shared and unique memory of a gunicorn master and its workers.
+
+Reads /proc/<pid>/smaps_rollup (Linux) for the master and every child:
+
+- RSS: resident memory, counting shared pages in full
+- PSS: resident memory with shared pages split between their users
+- USS: pages private to the process; what each extra worker really costs
+
+With ``preload_app`` (see gunicorn.conf.py) the model weights show up as
+shared memory and the per-worker USS stays small.
+
+Usage: python measure_worker_memory.py <master pid>
+"""
+
+import sys
+from pathlib import Path
+
+
+def memory_kb(pid: int) -> dict:
+    """Get the smaps_rollup counters of a process, in kB."""
+    counters = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        counters[name] = int(value.split()[0])
+    return {
+        "rss": counters["Rss"],
+        "pss": counters["Pss"],
+        "uss": counters["Private_Clean"] + counters["Private_Dirty"],
+        "shared": counters["Shared_Clean"] + counters["Shared_Dirty"],
+    }
+
+
+def children(pid: int) -> list:
+    """Get the pids of the direct children of a process."""
+    children_path = Path(f"/proc/{pid}/task/{pid}/children")
+    return [int(child) for child in children_path.read_text().split()]
+
+
+if len(sys.argv) != 2:
+    sys.exit(__doc__)
+
+master = int(sys.argv[1])
+processes = [("master", master)] + [
+    (f"worker {i}", pid) for i, pid in enumerate(children(master), start=1)
+]
+
+print(
+    f"{'process':<10} {'pid':>7} {'RSS MB':>9} {'PSS MB':>9} {'USS MB':>9} {'shared MB':>10}"
+)
+totals = {"rss": 0, "pss": 0, "uss": 0}
+for label, pid in processes:
+    usage = memory_kb(pid)
+    for key in totals:
+        totals[key] += usage[key]
+    print(
+        f"{label:<10} {pid:>7} {usage['rss'] / 1024:>9.1f} {usage['pss'] / 1024:>9.1f} "
+        f"{usage['uss'] / 1024:>9.1f} {usage['shared'] / 1024:>10.1f}"
+    )
+
+print(
+    f"{'total':<10} {'':>7} {totals['rss'] / 1024:>9.1f} {totals['pss'] / 1024:>9.1f} "
+    f"{totals['uss'] / 1024:>9.1f}"
+)
+print("PSS total is the real memory used by the whole server")
@@ -109,7 +109,7 @@ export class MLService {
             alternativeScores: prediction.top_predictions.map(
               (p: any) => p.probability,
             ),
-            modelVersion: "v1.0.0",
+            modelVersion: prediction.model_version ?? "v1.0.0",
             modelType: "RandomForest",
           },
         });